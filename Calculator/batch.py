@@ -0,0 +1,100 @@
+""" Headless batch evaluation of operation files
+
+Usage:
+    python batch.py operation.csv results.csv --workers 4
+"""
+
+import argparse
+import csv
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from computation import evaluate
+
+HEADER = ['Numero 1', ' Numero 2', 'Operation', ' Resultat']
+
+def parse_operator(operation):
+    """ Extract the operator from an operation label such as "15.0 + 5.0"
+    Args:
+        operation (str): the 'Operation' column
+    Returns:
+        str: the operator, or the whole label if it is not in the expected format
+    """
+    parts = operation.split()
+    return parts[1] if len(parts) == 3 else operation
+
+def evaluate_chunk(rows):
+    """ Evaluate a chunk of operations (runs in a worker process)
+    Args:
+        rows (list): rows [number 1, number 2, operation, ...] of the input file
+    Returns:
+        list: rows [number 1, number 2, operation, result] to write
+    """
+    results = []
+    for row in rows:
+        number_1, number_2, operation = (row + ['', '', ''])[:3]
+        operator = parse_operator(operation)
+        num1, num2, result = evaluate(number_1, operator, number_2)
+        results.append([number_1 if num1 is None else num1,
+                        number_2 if num2 is None else num2,
+                        f"{num1} {operator} {num2}" if num2 is not None else operation,
+                        result])
+    return results
+
+def run_batch(input_path, output_path, workers=None, chunk_size=10_000):
+    """ Evaluate every operation of a CSV file (same columns as operation.csv)
+    and write the results incrementally, in the input order.
+
+    The input is read chunk by chunk and at most two chunks per worker are in flight,
+    so memory stays bounded whatever the size of the file.
+    Args:
+        input_path (str): CSV file with the columns of operation.csv
+        output_path (str): CSV file to write
+        workers (int): number of worker processes, 1 to evaluate in the current process
+        chunk_size (int): number of operations sent to a worker at once
+    Returns:
+        int: number of operations evaluated
+    """
+    count = 0
+    with open(input_path, newline='', encoding='utf-8') as source, \
+            open(output_path, 'w', newline='', encoding='utf-8') as target:
+        reader = csv.reader(source)
+        writer = csv.writer(target)
+        header = next(reader, None)
+        writer.writerow(header or HEADER)
+        chunks = iter(lambda: list(islice(reader, chunk_size)), [])
+
+        if workers == 1:
+            for chunk in chunks:
+                results = evaluate_chunk(chunk)
+                writer.writerows(results)
+                count += len(results)
+            return count
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque()
+            max_in_flight = 2 * (workers or os.cpu_count() or 1)
+            for chunk in chunks:
+                in_flight.append(executor.submit(evaluate_chunk, chunk))
+                if len(in_flight) >= max_in_flight:
+                    results = in_flight.popleft().result()
+                    writer.writerows(results)
+                    count += len(results)
+            while in_flight:
+                results = in_flight.popleft().result()
+                writer.writerows(results)
+                count += len(results)
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate a CSV file of operations")
+    parser.add_argument('input_path')
+    parser.add_argument('output_path')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    arguments = parser.parse_args()
+    total = run_batch(arguments.input_path, arguments.output_path,
+                      arguments.workers, arguments.chunk_size)
+    print(f"{total} operations evaluated")
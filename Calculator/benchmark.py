@@ -0,0 +1,58 @@
+""" Throughput of the batch runner in operations per second, by number of workers
+
+Usage:
+    python benchmark.py --operations 1000000
+"""
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from batch import run_batch
+from computation import OPERATIONS
+
+def write_operations(path, operations, seed=0):
+    """Write a random operation file with the columns of operation.csv
+    Args:
+        path (str): file to write
+        operations (int): number of operations
+        seed (int): random seed
+    """
+    rng = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Numero 1', ' Numero 2', 'Operation', ' Resultat'])
+        for _ in range(operations):
+            num1 = round(rng.uniform(-1000, 1000), 2)
+            num2 = round(rng.uniform(-10, 10), 2)
+            operator = rng.choice(OPERATIONS)
+            writer.writerow([num1, num2, f"{num1} {operator} {num2}", ''])
+
+def benchmark(operations, workers, chunk_size):
+    """Run the batch runner on the same file for each number of workers
+    Args:
+        operations (int): number of operations in the file
+        workers (list): numbers of workers to compare
+        chunk_size (int): number of operations per chunk
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = os.path.join(tmp_dir, "operations.csv")
+        output_path = os.path.join(tmp_dir, "results.csv")
+        write_operations(input_path, operations)
+        print(f"{operations} operations, {os.cpu_count()} CPU available")
+        for max_workers in workers:
+            start = time.perf_counter()
+            run_batch(input_path, output_path, max_workers, chunk_size)
+            elapsed = time.perf_counter() - start
+            print(f"{max_workers} worker(s): {operations / elapsed:,.0f} operations/s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch runner throughput by worker count")
+    parser.add_argument('--operations', type=int, default=1_000_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    arguments = parser.parse_args()
+    benchmark(arguments.operations, arguments.workers, arguments.chunk_size)
@@ -0,0 +1,71 @@
+""" Calculator computation, independent of the Tkinter interface """
+
+OPERATIONS = ["+", "*", "**", "-", "/", "//", "%"]
+
+def parse_number(text):
+    """ Convert a user input into a number, accepting a comma as decimal separator
+    Args:
+        text (str): input user
+    Returns:
+        float: the number
+    Raises:
+        ValueError: the input is not a number
+    """
+    return float(str(text).strip().replace(',', '.'))
+
+def compute(num1, operator, num2):
+    """ Performs one operation
+    Args:
+        num1 (float): first number
+        operator (str): one of OPERATIONS
+        num2 (float): second number
+    Returns:
+        float: result of the operation
+    Raises:
+        ValueError: unknown operator
+        ZeroDivisionError: division by zero
+    """
+    match operator:
+        case "+":
+            return num1 + num2
+
+        case "-":
+            return num1 - num2
+
+        case "*":
+            return num1 * num2
+
+        case "**":
+            return num1 ** num2
+
+        case "/":
+            return num1 / num2
+
+        case "//":
+            return num1 // num2
+
+        case "%":
+            return num1 % num2
+
+    raise ValueError(f"unknown operator {operator!r}")
+
+def evaluate(number_1, operator, number_2):
+    """ Parse and compute one operation, returning the message shown by the calculator on error
+    Args:
+        number_1 (str): input user
+        operator (str): operator selected by user
+        number_2 (str): input user
+    Returns:
+        tuple: (num1, num2, result) where result is the number or the error message
+    """
+    num1 = num2 = None
+    try:
+        num1 = parse_number(number_1)
+        num2 = parse_number(number_2)
+        return num1, num2, compute(num1, operator, num2)
+    except ValueError as e:
+        return num1, num2, f"Input error: {e}"
+    except ZeroDivisionError:
+        return num1, num2, "Division by zero impossible"
+    except OverflowError as e:
+        return num1, num2, f"Overflow error: {e}"
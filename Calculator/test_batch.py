@@ -0,0 +1,45 @@
+""" Test headless batch evaluation """
+import csv
+import pytest
+from batch import parse_operator, run_batch
+
+ROWS = [['15.5', '5.0', '15.5 + 5.0', ''],
+        ['15', '0', '15 / 0', ''],
+        ['2', '10', '2 ** 10', ''],
+        ['abc', '5', 'abc % 5', ''],
+        ['7,5', '2', '7,5 // 2', '']]
+
+def write_operations(path, rows):
+    """Write an operation file with the header of operation.csv
+    Args:
+        path (Path): file to write
+        rows (list): rows of operations
+    """
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Numero 1', ' Numero 2', 'Operation', ' Resultat'])
+        writer.writerows(rows)
+
+def test_parse_operator():
+    """Check the operator is read from the operation label
+    """
+    assert parse_operator("15.0 // 5.0") == "//"
+    assert parse_operator("15.0+5.0") == "15.0+5.0"
+
+@pytest.mark.parametrize("workers, chunk_size", [(1, 2), (2, 2), (2, 100)])
+def test_run_batch(tmp_path, workers, chunk_size):
+    """Check results are written in the input order whatever the number of workers
+    Args:
+        workers (int): number of worker processes
+        chunk_size (int): number of operations per chunk
+    """
+    write_operations(tmp_path / "input.csv", ROWS)
+    count = run_batch(tmp_path / "input.csv", tmp_path / "output.csv", workers, chunk_size)
+    with open(tmp_path / "output.csv", newline='', encoding='utf-8') as file:
+        header, *results = list(csv.reader(file))
+    assert count == len(ROWS)
+    assert header == ['Numero 1', ' Numero 2', 'Operation', ' Resultat']
+    assert [row[3] for row in results] == ['20.5', 'Division by zero impossible', '1024.0',
+                                          "Input error: could not convert string to float: 'abc'",
+                                          '3.0']
+    assert results[4][2] == '7.5 // 2.0'
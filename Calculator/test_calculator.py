@@ -1,5 +1,6 @@
 """ Test Calculator Tkinter """
 import pytest
+from computation import compute, evaluate, parse_number
 
 @pytest.mark.parametrize("number_1, operator, number_2", [('15', '+', '5'),
                                                         ('15','-', '5'),
@@ -15,28 +16,28 @@ def test_perf_ope(number_1, operator, number_2):
         operator (str): operator selected by user
         number_2 (str): input user
     """
-    float(number_1, number_2)
-    match operator:
-        case "+":
-            computed_result = number_1 + number_2
-
-        case "-":
-            computed_result = number_1 - number_2
-
-        case "*":
-            computed_result = number_1 * number_2
-
-        case "**":
-            computed_result = number_1 ** number_2
-
-        case "/":
-            computed_result = number_1 / number_2
-
-        case "//":
-            computed_result = number_1 // number_2
-
-        case "%":
-            computed_result = number_1 % number_2
+    computed_result = compute(parse_number(number_1), operator, parse_number(number_2))
 
     expected_result = eval(f"{number_1} {operator} {number_2}")
     assert computed_result == expected_result
+
+def test_parse_number():
+    """Check that a comma is accepted as decimal separator
+    """
+    assert parse_number('15,5') == parse_number(' 15.5 ') == 15.5
+    with pytest.raises(ValueError):
+        parse_number('abc')
+
+@pytest.mark.parametrize("number_1, operator, number_2, message", [('15', '/', '0', "Division by zero impossible"),
+                                                                 ('abc', '+', '5', "Input error"),
+                                                                 ('15', '?', '5', "Input error"),
+                                                                 ('1e308', '**', '2', "Overflow error")])
+def test_evaluate_error(number_1, operator, number_2, message):
+    """Check that errors give the message displayed by the calculator
+    Args:
+        number_1 (str): input user
+        operator (str): operator selected by user
+        number_2 (str): input user
+        message (str): start of the expected message
+    """
+    assert evaluate(number_1, operator, number_2)[2].startswith(message)
@@ -0,0 +1,257 @@
+"""
+Ce module contient l'archive des pages brutes téléchargées par FromageETL.
+"""
+import gzip
+import hashlib
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from scrap_jerome import build_frame, parse_page
+
+try:
+    import zstandard
+except ImportError:  # zstd est optionnel, gzip reste disponible
+    zstandard = None
+
+
+class PageArchive:
+    """
+    Une archive adressée par contenu des réponses brutes récupérées sur le web.
+    Chaque page est compressée (gzip ou zstd) et stockée sous le nom de son empreinte
+    SHA-256 ; un index SQLite associe l'URL et la date de récupération à cette empreinte.
+    Deux récupérations identiques ne sont donc stockées qu'une seule fois.
+
+    Attributes :
+    - root (str) : Le dossier contenant l'archive.
+    - compression (str) : L'algorithme de compression utilisé ('gzip' ou 'zstd').
+    """
+
+    INDEX_NAME = "index.sqlite"
+    EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst'}
+
+    def __init__(self, root, compression='gzip'):
+        """
+        Initialise une instance de la classe PageArchive.
+
+        Parameters:
+        - root (str): Le dossier contenant l'archive, créé s'il n'existe pas.
+        - compression (str): 'gzip' (par défaut) ou 'zstd' (nécessite le paquet zstandard).
+        """
+        if compression not in self.EXTENSIONS:
+            raise ValueError(f"Compression inconnue : {compression}")
+        if compression == 'zstd' and zstandard is None:
+            raise ImportError("La compression zstd nécessite le paquet zstandard")
+        self.root = str(root)
+        self.compression = compression
+        os.makedirs(os.path.join(self.root, "objects"), exist_ok=True)
+        con = sqlite3.connect(self._index_path())
+        con.execute("CREATE TABLE IF NOT EXISTS pages ("
+                    "url TEXT NOT NULL, fetched_at TEXT NOT NULL, "
+                    "sha256 TEXT NOT NULL, compression TEXT NOT NULL, size INTEGER NOT NULL)")
+        con.execute("CREATE INDEX IF NOT EXISTS pages_url_idx ON pages (url, fetched_at)")
+        con.commit()
+        con.close()
+
+    def _index_path(self):
+        """
+        Retourne le chemin de l'index SQLite de l'archive.
+        """
+        return os.path.join(self.root, self.INDEX_NAME)
+
+    def _object_path(self, sha256, compression):
+        """
+        Retourne le chemin du fichier compressé correspondant à une empreinte.
+        """
+        return os.path.join(self.root, "objects", sha256[:2],
+                            sha256 + self.EXTENSIONS[compression])
+
+    def store(self, url, content, fetched_at=None):
+        """
+        Archive le contenu brut d'une page.
+
+        Parameters:
+        - url (str): L'URL de la page.
+        - content (bytes): Les octets téléchargés.
+        - fetched_at (datetime): La date de récupération, maintenant par défaut.
+
+        Returns:
+        - str: L'empreinte SHA-256 du contenu.
+        """
+        fetched_at = fetched_at or datetime.now()
+        sha256 = hashlib.sha256(content).hexdigest()
+        path = self._object_path(sha256, self.compression)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Écriture dans un fichier temporaire propre à cet appel, puis renommage atomique :
+            # plusieurs threads ou processus peuvent archiver le même contenu en même temps
+            descriptor, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(descriptor, 'wb') as file:
+                    file.write(_compress(content, self.compression))
+                os.replace(tmp_path, path)
+            except OSError:
+                # Un autre appel a déjà écrit le même objet : le contenu est identique
+                if not os.path.exists(path):
+                    raise
+            finally:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+        con = sqlite3.connect(self._index_path())
+        con.execute("INSERT INTO pages VALUES (?, ?, ?, ?, ?)",
+                    (url, fetched_at.isoformat(), sha256, self.compression, len(content)))
+        con.commit()
+        con.close()
+        return sha256
+
+    def load(self, sha256):
+        """
+        Relit le contenu brut d'une page archivée.
+
+        Parameters:
+        - sha256 (str): L'empreinte du contenu.
+
+        Returns:
+        - bytes: Les octets de la page, décompressés.
+        """
+        return read_object(self.root, sha256)
+
+    def entries(self, url=None):
+        """
+        Liste les pages archivées, de la plus ancienne à la plus récente.
+
+        Parameters:
+        - url (str): Limite la liste à une URL donnée (toutes les URL par défaut).
+
+        Returns:
+        - pd.DataFrame: Un DataFrame avec les colonnes 'url', 'fetched_at', 'sha256',
+          'compression' et 'size'.
+        """
+        con = sqlite3.connect(self._index_path())
+        if url is None:
+            entries = pd.read_sql_query("SELECT * FROM pages ORDER BY fetched_at", con)
+        else:
+            entries = pd.read_sql_query("SELECT * FROM pages WHERE url = ? ORDER BY fetched_at",
+                                        con, params=(url,))
+        con.close()
+        return entries
+
+    def latest(self, url, fetched_at=None):
+        """
+        Retourne l'empreinte de la dernière récupération d'une URL.
+
+        Parameters:
+        - url (str): L'URL recherchée.
+        - fetched_at (datetime): Si précisé, la dernière récupération antérieure à cette date.
+
+        Returns:
+        - str: L'empreinte SHA-256, ou None si l'URL n'a jamais été archivée.
+        """
+        query = "SELECT sha256 FROM pages WHERE url = ?"
+        params = [url]
+        if fetched_at is not None:
+            query += " AND fetched_at <= ?"
+            params.append(fetched_at.isoformat())
+        query += " ORDER BY fetched_at DESC LIMIT 1"
+        con = sqlite3.connect(self._index_path())
+        row = con.execute(query, params).fetchone()
+        con.close()
+        return row[0] if row else None
+
+    def retransform_all(self, url=None, max_workers=None):
+        """
+        Transforme à nouveau toutes les pages archivées, sans aucun accès réseau.
+
+        Chaque contenu distinct n'est analysé qu'une fois, même s'il a été récupéré
+        à plusieurs dates ou depuis plusieurs URL ; ses lignes sont ensuite reprises
+        pour chaque entrée de l'index. Les contenus sont analysés dans un pool de processus ;
+        chaque processus relit lui-même les fichiers compressés pour éviter de transférer
+        les octets bruts.
+
+        Parameters:
+        - url (str): Limite la transformation à une URL donnée (toutes les URL par défaut).
+        - max_workers (int): Le nombre de processus, le nombre de cœurs par défaut.
+          Avec 1, l'analyse est faite dans le processus courant.
+
+        Returns:
+        - pd.DataFrame: Les lignes de toutes les pages, avec les colonnes 'fromage_names',
+          'fromage_familles', 'pates', 'creation_date' (date de récupération) et 'url'.
+        """
+        entries = self.entries(url)
+        digests = list(dict.fromkeys(entries['sha256']))
+        tasks = [(self.root, sha256) for sha256 in digests]
+        if max_workers == 1:
+            parsed = dict(zip(digests, map(_parse_archived, tasks)))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                parsed = dict(zip(digests, executor.map(_parse_archived, tasks)))
+
+        fromage_names = []
+        fromage_familles = []
+        pates = []
+        creation_dates = []
+        urls = []
+        for entry in entries.itertuples(index=False):
+            names, familles, page_pates = parsed[entry.sha256]
+            fromage_names.extend(names)
+            fromage_familles.extend(familles)
+            pates.extend(page_pates)
+            creation_dates.extend([pd.Timestamp(entry.fetched_at)] * len(names))
+            urls.extend([entry.url] * len(names))
+
+        data = build_frame(fromage_names, fromage_familles, pates)
+        data['creation_date'] = pd.Series(creation_dates, dtype='datetime64[ns]')
+        data['url'] = pd.Series(urls, dtype=object)
+        return data
+
+
+def read_object(root, sha256):
+    """
+    Relit et décompresse un objet de l'archive, quel que soit son algorithme.
+
+    Parameters:
+    - root (str): Le dossier de l'archive.
+    - sha256 (str): L'empreinte du contenu.
+
+    Returns:
+    - bytes: Les octets de la page.
+    """
+    for compression, extension in PageArchive.EXTENSIONS.items():
+        path = os.path.join(root, "objects", sha256[:2], sha256 + extension)
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                return _decompress(file.read(), compression)
+    raise KeyError(f"Objet absent de l'archive : {sha256}")
+
+
+def _compress(content, compression):
+    """
+    Compresse des octets avec l'algorithme demandé.
+    """
+    if compression == 'zstd':
+        return zstandard.ZstdCompressor().compress(content)
+    return gzip.compress(content)
+
+
+def _decompress(content, compression):
+    """
+    Décompresse des octets avec l'algorithme demandé.
+    """
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ImportError("La lecture d'un objet zstd nécessite le paquet zstandard")
+        return zstandard.ZstdDecompressor().decompress(content)
+    return gzip.decompress(content)
+
+
+def _parse_archived(task):
+    """
+    Relit un objet de l'archive et l'analyse (exécuté dans un processus du pool).
+    """
+    root, sha256 = task
+    return parse_page(read_object(root, sha256))
@@ -0,0 +1,338 @@
+"""
+Ce module contient les mesures de performance du traitement des fromages.
+
+Usage:
+    python benchmarks.py transform
+    python benchmarks.py history
+    python benchmarks.py stats
+    python benchmarks.py service
+    python benchmarks.py dedupe
+"""
+import argparse
+import os
+import random
+import string
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from http.client import HTTPConnection
+
+import pandas as pd
+
+from dedupe import dedupe
+from history import FromageHistory
+from scrap_jerome import FromageETL
+from service import FromageService
+
+FAMILLES = ["Savoyarde", "Auvergnate", "Brie", "Chèvre", "Bleu", "Normande", "Corse"]
+PATES = ["Molle", "Pressée", "Pressée cuite", "Persillée", "Fraîche"]
+
+
+def synthetic_name(rng):
+    """
+    Génère un nom de fromage aléatoire.
+
+    Parameters:
+    - rng (random.Random): Le générateur aléatoire.
+
+    Returns:
+    - str: Un nom de fromage commençant par une majuscule.
+    """
+    return rng.choice(string.ascii_uppercase) + "".join(
+        rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 12)))
+
+
+def synthetic_page(rng, rows):
+    """
+    Génère une page HTML au format du site, avec une table de fromages aléatoires.
+
+    Parameters:
+    - rng (random.Random): Le générateur aléatoire.
+    - rows (int): Le nombre de lignes de la table.
+
+    Returns:
+    - bytes: Le contenu de la page.
+    """
+    lines = ["<html><body><table><tr><td>Fromage</td><td>Famille</td><td>Pâte</td></tr>"]
+    for _ in range(rows):
+        lines.append(f"<tr><td>{synthetic_name(rng)}</td><td>{rng.choice(FAMILLES)}</td>"
+                     f"<td>{rng.choice(PATES)}</td></tr>")
+    lines.append("</table></body></html>")
+    return "\n".join(lines).encode('utf-8')
+
+
+def bench_transform(pages=64, rows=500, workers=(1, 2, 4, 8), chunksize=4):
+    """
+    Mesure le passage à l'échelle de FromageETL.transform_many selon le nombre de processus.
+
+    Parameters:
+    - pages (int): Le nombre de pages synthétiques.
+    - rows (int): Le nombre de lignes par page.
+    - workers (tuple): Les nombres de processus à comparer.
+    - chunksize (int): Le nombre de pages par lot.
+    """
+    rng = random.Random(0)
+    contents = [synthetic_page(rng, rows) for _ in range(pages)]
+    print(f"{pages} pages x {rows} lignes, {os.cpu_count()} cœurs disponibles")
+
+    etl = FromageETL(None)
+    reference = None
+    for max_workers in workers:
+        start = time.perf_counter()
+        etl.transform_many(contents, max_workers=max_workers, chunksize=chunksize)
+        elapsed = time.perf_counter() - start
+        reference = reference or elapsed
+        print(f"{max_workers} processus : {elapsed:.2f} s, "
+              f"{len(etl.data) / elapsed:,.0f} lignes/s, accélération x{reference / elapsed:.2f}")
+
+
+def synthetic_frame(rng, rows):
+    """
+    Génère un DataFrame de fromages aléatoires.
+
+    Parameters:
+    - rng (random.Random): Le générateur aléatoire.
+    - rows (int): Le nombre de lignes.
+
+    Returns:
+    - pd.DataFrame: Un DataFrame avec les colonnes 'fromage_names', 'fromage_familles' et 'pates'.
+    """
+    return pd.DataFrame({
+        'fromage_names': [synthetic_name(rng) for _ in range(rows)],
+        'fromage_familles': [rng.choice(FAMILLES) for _ in range(rows)],
+        'pates': [rng.choice(PATES) for _ in range(rows)]
+    })
+
+
+def bench_history(rows=10_000, loads=100, churn=0.01):
+    """
+    Mesure la croissance du stockage versionné sur des chargements successifs
+    où une fraction des lignes change, comparée à une copie complète par chargement.
+
+    Parameters:
+    - rows (int): Le nombre de lignes de la table.
+    - loads (int): Le nombre de chargements simulés.
+    - churn (float): La fraction des lignes remplacées à chaque chargement.
+    """
+    rng = random.Random(0)
+    data = synthetic_frame(rng, rows)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        history = FromageHistory(os.path.join(tmp_dir, "history.sqlite"), "fromages_table")
+        full_copy = os.path.join(tmp_dir, "copy.sqlite")
+        start_date = datetime(2024, 1, 1)
+        load_time = 0.0
+        for load in range(loads):
+            changed = rng.sample(range(rows), int(rows * churn))
+            data.loc[changed, 'fromage_names'] = [synthetic_name(rng) for _ in changed]
+            start = time.perf_counter()
+            history.load(data, loaded_at=start_date + timedelta(days=load))
+            load_time += time.perf_counter() - start
+        etl = FromageETL(None)
+        etl.data = data
+        etl.load(full_copy, "fromages_table")
+
+        history_size = os.path.getsize(history.database_name)
+        copies_size = os.path.getsize(full_copy) * loads
+        print(f"{loads} chargements de {rows:,} lignes, {churn:.0%} de changements")
+        print(f"chargement versionné moyen : {load_time / loads * 1000:.1f} ms")
+        print(f"historique : {history_size / 1e6:.2f} Mo, "
+              f"{loads} copies complètes : {copies_size / 1e6:.2f} Mo")
+
+        for as_of in (1, loads // 2, loads):
+            start = time.perf_counter()
+            snapshot = history.read(as_of=as_of)
+            elapsed = time.perf_counter() - start
+            print(f"lecture as_of={as_of} : {len(snapshot):,} lignes en {elapsed * 1000:.1f} ms")
+
+
+def bench_stats(rows=1_000, edits=100_000, naive_samples=200):
+    """
+    Mesure add_row, update_fromage_name et delete_row de FromageETL lorsqu'une lecture
+    de count_by_letter et de total_count suit chaque modification.
+
+    Le temps de la modification du DataFrame (concat, masque ou filtrage, en O(n)) est
+    séparé de celui de la lecture des statistiques, tenues à jour en O(1) par ligne
+    modifiée, et comparé au recalcul de la lecture par value_counts.
+
+    Chaque modification coûte quelques millisecondes à cause du DataFrame : les 100 000
+    modifications partent donc d'une table de 1 000 lignes (environ 11 000 à la fin,
+    les ajouts étant plus fréquents que les suppressions) pour durer quelques minutes.
+
+    Parameters:
+    - rows (int): Le nombre de lignes initial.
+    - edits (int): Le nombre de modifications (ajout, renommage ou suppression).
+    - naive_samples (int): Le nombre de recalculs complets chronométrés.
+    """
+    rng = random.Random(0)
+    etl = FromageETL(None)
+    etl.data = synthetic_frame(rng, rows)
+    start = time.perf_counter()
+    etl.count_by_letter()
+    rebuild_time = time.perf_counter() - start
+
+    names = etl.data['fromage_names'].tolist()
+    timings = {action: [0.0, 0.0, 0] for action in ('add_row', 'update_fromage_name',
+                                                    'delete_row')}
+    for _ in range(edits):
+        action = rng.random()
+        start = time.perf_counter()
+        if action < 0.4 or not names:
+            name = synthetic_name(rng)
+            etl.add_row(name, rng.choice(FAMILLES), rng.choice(PATES))
+            names.append(name)
+            timing = timings['add_row']
+        elif action < 0.7:
+            index = rng.randrange(len(names))
+            new_name = synthetic_name(rng)
+            etl.update_fromage_name(names[index], new_name)
+            names[index] = new_name
+            timing = timings['update_fromage_name']
+        else:
+            index = rng.randrange(len(names))
+            names[index], names[-1] = names[-1], names[index]
+            etl.delete_row(names.pop())
+            timing = timings['delete_row']
+        edited = time.perf_counter()
+        etl.count_by_letter()
+        etl.total_count()
+        timing[0] += edited - start
+        timing[1] += time.perf_counter() - edited
+        timing[2] += 1
+
+    start = time.perf_counter()
+    for _ in range(naive_samples):
+        etl.data['fromage_names'].str[0].value_counts()
+        len(etl.data)
+    naive_time = (time.perf_counter() - start) / naive_samples
+
+    print(f"{rows:,} lignes initiales, {edits:,} modifications suivies chacune d'une lecture")
+    print(f"reconstruction initiale : {rebuild_time * 1000:.1f} ms")
+    for action, (edit_time, query_time, count) in timings.items():
+        if count:
+            print(f"{action} : {(edit_time + query_time) / count * 1000:.2f} ms par appel "
+                  f"(modification du DataFrame {edit_time / count * 1000:.2f} ms, "
+                  f"lecture {query_time / count * 1e6:.0f} µs)")
+    print(f"lecture recalculée par value_counts : {naive_time * 1000:.2f} ms")
+
+
+def bench_service(rows=50_000, clients=8, duration=10.0, revalidate=0.5):
+    """
+    Test de charge du service HTTP sur localhost : des clients à connexion persistante
+    envoient en boucle des requêtes variées pendant `duration` secondes.
+    Une partie des requêtes renvoie l'ETag déjà reçu, comme le ferait un client avec cache.
+
+    Parameters:
+    - rows (int): Le nombre de lignes de la table servie.
+    - clients (int): Le nombre de clients simultanés.
+    - duration (float): La durée du test en secondes.
+    - revalidate (float): La part des requêtes envoyées avec If-None-Match.
+    """
+    paths = ["/count", "/stats/familles", "/stats/lettres", "/search?q=ab&limit=50",
+             "/fromages?pate=Molle&limit=200", "/fromages?lettre=C&limit=1000"]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_name = os.path.join(tmp_dir, "fromages.sqlite")
+        etl = FromageETL(None)
+        etl.data = synthetic_frame(random.Random(0), rows)
+        etl.load(database_name, "fromages_table")
+        service = FromageService(database_name, port=0)
+        service.start()
+        host, port = service.server.server_address[:2]
+
+        latencies = []
+        statuses = []
+        deadline = time.perf_counter() + duration
+
+        def client(seed):
+            rng = random.Random(seed)
+            con = HTTPConnection(host, port)
+            etags = {}
+            while time.perf_counter() < deadline:
+                path = rng.choice(paths)
+                headers = {'Accept-Encoding': 'gzip'}
+                if path in etags and rng.random() < revalidate:
+                    headers['If-None-Match'] = etags[path]
+                start = time.perf_counter()
+                con.request("GET", path, headers=headers)
+                response = con.getresponse()
+                response.read()
+                latencies.append(time.perf_counter() - start)
+                statuses.append(response.status)
+                etags[path] = response.getheader("ETag")
+            con.close()
+
+        threads = [threading.Thread(target=client, args=(seed,)) for seed in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        service.stop()
+
+    latencies.sort()
+    print(f"{rows:,} lignes, {clients} clients, {duration:.0f} s")
+    print(f"{len(latencies) / duration:,.0f} requêtes/s, "
+          f"dont {statuses.count(304) / len(statuses):.0%} de réponses 304")
+    print(f"latence p50 : {latencies[len(latencies) // 2] * 1000:.2f} ms, "
+          f"p99 : {latencies[int(len(latencies) * 0.99)] * 1000:.2f} ms")
+
+
+def variant(rng, name):
+    """
+    Retourne une variante d'un nom : casse, espaces, accent ou, plus rarement, faute de frappe.
+
+    Parameters:
+    - rng (random.Random): Le générateur aléatoire.
+    - name (str): Le nom d'origine.
+
+    Returns:
+    - str: La variante du nom.
+    """
+    roll = rng.random()
+    if roll < 0.2:
+        return name.upper()
+    if roll < 0.4:
+        return f"  {name} "
+    if roll < 0.6:
+        return name.replace('e', 'é', 1)
+    if roll < 0.62:
+        position = rng.randrange(1, len(name))
+        return name[:position] + name[position + 1:]
+    return name
+
+
+def bench_dedupe(rows=1_000_000, distinct=50_000, near_threshold=0.9):
+    """
+    Mesure les étapes de normalisation et de dédoublonnage sur des variantes
+    d'un ensemble de noms distincts.
+
+    Parameters:
+    - rows (int): Le nombre de lignes en entrée.
+    - distinct (int): Le nombre de fromages distincts.
+    - near_threshold (float): Le seuil du passage des quasi-doublons.
+    """
+    rng = random.Random(0)
+    names = list({synthetic_name(rng) for _ in range(distinct)})
+    data = pd.DataFrame({
+        'fromage_names': [variant(rng, rng.choice(names)) for _ in range(rows)],
+        'fromage_familles': [rng.choice(FAMILLES) for _ in range(rows)],
+        'pates': [rng.choice(PATES) for _ in range(rows)]
+    })
+    print(f"{rows:,} lignes, {len(names):,} fromages distincts")
+    _, report = dedupe(data, near_threshold=near_threshold)
+    for step in report:
+        print(f"{step['stage']:<10} {step['rows_in']:>10,} -> {step['rows_out']:>10,} lignes "
+              f"en {step['seconds']:.2f} s")
+
+
+BENCHMARKS = {
+    'transform': bench_transform,
+    'history': bench_history,
+    'stats': bench_stats,
+    'service': bench_service,
+    'dedupe': bench_dedupe,
+}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('benchmark', choices=BENCHMARKS)
+    BENCHMARKS[parser.parse_args().benchmark]()
@@ -0,0 +1,273 @@
+"""
+Ce module contient le robot d'exploration des pages du catalogue de fromages.
+"""
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from urllib.error import HTTPError
+from urllib.parse import urldefrag, urljoin, urlsplit
+from urllib.request import Request, urlopen
+from urllib.robotparser import RobotFileParser
+from bs4 import BeautifulSoup
+
+
+import pandas as pd
+
+from scrap_jerome import FromageETL, parse_page
+
+
+class HostThrottle:
+    """
+    Limite le débit des requêtes par hôte : deux requêtes vers un même hôte
+    sont espacées d'au moins `delay` secondes, même depuis plusieurs threads.
+
+    Attributes :
+    - delay (float) : L'intervalle minimal entre deux requêtes vers un même hôte.
+    """
+
+    def __init__(self, delay):
+        """
+        Initialise une instance de la classe HostThrottle.
+
+        Parameters:
+        - delay (float): L'intervalle minimal en secondes entre deux requêtes d'un hôte.
+        """
+        self.delay = delay
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host, delay=None):
+        """
+        Bloque jusqu'à ce qu'une requête vers l'hôte soit autorisée.
+
+        Parameters:
+        - host (str): L'hôte visé.
+        - delay (float): Un intervalle propre à l'hôte (Crawl-delay de robots.txt par exemple).
+        """
+        delay = self.delay if delay is None else max(delay, self.delay)
+        # Réserve le créneau sous verrou, puis dort en dehors du verrou
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + delay
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class FromageCrawler:
+    """
+    Un robot qui découvre, à partir d'une page de départ, les pages de liste du catalogue
+    (pages par lettre, pagination), les télécharge en parallèle dans un pool de threads
+    et les analyse dans un pool de processus, puis fusionne toutes les lignes en un seul
+    DataFrame au format de FromageETL.
+
+    Attributes :
+    - seed_url (str) : La page de départ.
+    - max_pages (int) : Le nombre maximal de pages téléchargées.
+    - link_pattern (re.Pattern) : Expression que doivent vérifier les liens suivis, ou None.
+    - user_agent (str) : L'agent utilisateur envoyé et vérifié dans robots.txt.
+    - errors (list) : Les couples (url, erreur) des pages qui n'ont pas pu être téléchargées.
+    """
+
+    def __init__(self, seed_url, max_pages=100, delay=1.0, fetch_workers=4, parse_workers=None,
+                 link_pattern=None, user_agent="FromageCrawler", archive=None, timeout=30):
+        """
+        Initialise une instance de la classe FromageCrawler.
+
+        Parameters:
+        - seed_url (str): La page de départ.
+        - max_pages (int): Le nombre maximal de pages téléchargées.
+        - delay (float): L'intervalle minimal en secondes entre deux requêtes d'un même hôte.
+        - fetch_workers (int): Le nombre de téléchargements simultanés.
+        - parse_workers (int): Le nombre de processus d'analyse, le nombre de cœurs par défaut.
+        - link_pattern (str): Si précisée, seuls les liens vérifiant cette expression sont suivis.
+        - user_agent (str): L'agent utilisateur du robot.
+        - archive (PageArchive): Si précisée, chaque page téléchargée y est archivée.
+        - timeout (float): Le délai maximal d'une requête en secondes.
+        """
+        self.seed_url = urldefrag(seed_url)[0]
+        self.max_pages = max_pages
+        self.fetch_workers = fetch_workers
+        self.parse_workers = parse_workers
+        self.link_pattern = re.compile(link_pattern) if link_pattern else None
+        self.user_agent = user_agent
+        self.archive = archive
+        self.timeout = timeout
+        self.throttle = HostThrottle(delay)
+        self.errors = []
+        self._robots = {}
+        self._robots_lock = threading.Lock()
+
+    def _robots_for(self, url):
+        """
+        Retourne les règles robots.txt de l'hôte d'une URL, téléchargées une seule fois.
+
+        robots.txt est demandé avec l'agent utilisateur et le délai d'attente du robot,
+        sans tenir le verrou pendant le téléchargement.
+        """
+        parts = urlsplit(url)
+        with self._robots_lock:
+            robots = self._robots.get(parts.netloc)
+        if robots is not None:
+            return robots
+
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        robots = RobotFileParser(robots_url)
+        request = Request(robots_url, headers={'User-Agent': self.user_agent})
+        try:
+            with urlopen(request, timeout=self.timeout) as response:
+                lines = response.read().decode('utf-8', errors='replace').splitlines()
+        except HTTPError as error:
+            if error.code in (401, 403):
+                # Accès refusé à robots.txt : rien n'est autorisé, comme RobotFileParser.read
+                robots.disallow_all = True
+            else:
+                robots.parse([])
+        except OSError:
+            # robots.txt injoignable : tout est autorisé
+            robots.parse([])
+        else:
+            robots.parse(lines)
+        with self._robots_lock:
+            return self._robots.setdefault(parts.netloc, robots)
+
+    def allowed(self, url):
+        """
+        Indique si une URL peut être suivie : même hôte que la page de départ,
+        expression de filtre vérifiée et autorisation de robots.txt.
+
+        Parameters:
+        - url (str): L'URL à vérifier.
+
+        Returns:
+        - bool: True si l'URL peut être téléchargée.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            return False
+        if parts.netloc != urlsplit(self.seed_url).netloc:
+            return False
+        if self.link_pattern is not None and url != self.seed_url \
+                and not self.link_pattern.search(url):
+            return False
+        return self._robots_for(url).can_fetch(self.user_agent, url)
+
+    def fetch(self, url):
+        """
+        Télécharge une page en respectant la limite de débit de son hôte.
+
+        Parameters:
+        - url (str): L'URL de la page.
+
+        Returns:
+        - bytes: Le contenu brut de la page.
+        """
+        crawl_delay = self._robots_for(url).crawl_delay(self.user_agent)
+        self.throttle.wait(urlsplit(url).netloc, float(crawl_delay) if crawl_delay else None)
+        request = Request(url, headers={'User-Agent': self.user_agent})
+        with urlopen(request, timeout=self.timeout) as response:
+            content = response.read()
+        if self.archive is not None:
+            self.archive.store(url, content)
+        return content
+
+    def crawl(self):
+        """
+        Explore le catalogue à partir de la page de départ.
+
+        Les URL découvertes sont dédupliquées (fragment retiré) avant d'entrer dans la file
+        d'attente ; au plus `fetch_workers` téléchargements sont en cours à la fois.
+
+        Returns:
+        - pd.DataFrame: Les lignes de toutes les pages, dans l'ordre de découverte, avec les
+          colonnes 'fromage_names', 'fromage_familles', 'pates' et 'creation_date'.
+        """
+        frontier = deque()
+        # URL déjà rencontrées, avec leur rang de découverte
+        order = {}
+        pages = {}
+
+        def enqueue(url):
+            url = urldefrag(url)[0]
+            if url not in order and len(order) < self.max_pages and self.allowed(url):
+                order[url] = len(order)
+                frontier.append(url)
+
+        enqueue(self.seed_url)
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as fetch_pool, \
+                ProcessPoolExecutor(max_workers=self.parse_workers) as parse_pool:
+            fetching = {}
+            parsing = {}
+            while frontier or fetching or parsing:
+                while frontier and len(fetching) < self.fetch_workers:
+                    url = frontier.popleft()
+                    fetching[fetch_pool.submit(self.fetch, url)] = url
+
+                done, _ = wait(list(fetching) + list(parsing), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in fetching:
+                        url = fetching.pop(future)
+                        try:
+                            content = future.result()
+                        except OSError as error:
+                            self.errors.append((url, error))
+                            continue
+                        parsing[parse_pool.submit(_parse_listing, url, content)] = url
+                    else:
+                        url = parsing.pop(future)
+                        rows, links = future.result()
+                        pages[url] = rows
+                        for link in links:
+                            enqueue(link)
+
+        fromage_names = []
+        fromage_familles = []
+        pates = []
+        for url in sorted(pages, key=order.get):
+            names, familles, page_pates = pages[url]
+            fromage_names.extend(names)
+            fromage_familles.extend(familles)
+            pates.extend(page_pates)
+
+        data = pd.DataFrame({
+            'fromage_names': fromage_names,
+            'fromage_familles': fromage_familles,
+            'pates': pates
+        })
+        data['creation_date'] = datetime.now()
+        return data
+
+    def load(self, database_name, table_name):
+        """
+        Explore le catalogue puis charge toutes les lignes en une seule fois
+        dans une table SQLite spécifiée.
+
+        Parameters:
+        - database_name (str): Le nom de la base de données SQLite.
+        - table_name (str): Le nom de la table dans laquelle charger les données.
+
+        Returns:
+        - pd.DataFrame: Les données chargées.
+        """
+        etl = FromageETL(self.seed_url, archive=self.archive)
+        etl.data = self.crawl()
+        return etl.load(database_name, table_name)
+
+
+def _parse_listing(url, content):
+    """
+    Analyse une page de liste (exécuté dans un processus du pool).
+
+    Parameters:
+    - url (str): L'URL de la page, pour résoudre les liens relatifs.
+    - content (bytes): Le contenu brut de la page.
+
+    Returns:
+    - tuple: Les lignes de la page (voir parse_page) et la liste des liens absolus trouvés.
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+    links = [urljoin(url, anchor['href']) for anchor in soup.find_all('a', href=True)]
+    return parse_page(soup), links
@@ -0,0 +1,136 @@
+"""
+Ce module contient la normalisation des noms et le dédoublonnage des fromages.
+"""
+import time
+import unicodedata
+from difflib import SequenceMatcher
+
+
+def normalise_key(name):
+    """
+    Calcule la clé de comparaison d'un nom de fromage : décomposition Unicode NFKD,
+    suppression des accents, casefold et espaces réduits à un seul.
+    'Comté', ' comte ' et 'COMTÉ' ont ainsi la même clé.
+
+    Parameters:
+    - name (str): Le nom du fromage.
+
+    Returns:
+    - str: La clé normalisée.
+    """
+    if not isinstance(name, str):
+        return ''
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
+
+
+def exact_duplicates(keys):
+    """
+    Repère les doublons exacts d'une liste de clés à l'aide d'un ensemble.
+
+    Parameters:
+    - keys (list): Les clés normalisées.
+
+    Returns:
+    - list: Pour chaque clé, True si elle est conservée (première occurrence).
+    """
+    seen = set()
+    keep = []
+    for key in keys:
+        keep.append(key not in seen)
+        seen.add(key)
+    return keep
+
+
+def near_duplicates(keys, threshold=0.9, window=4):
+    """
+    Repère les quasi-doublons (fautes de frappe, lettre manquante) d'une liste de clés.
+
+    Les clés sont regroupées par première lettre, puis triées dans chaque groupe ;
+    chaque clé n'est comparée qu'aux `window` clés précédentes de son groupe (voisinage trié),
+    ce qui garde un coût proportionnel à n * window au lieu de n². Des clés proches sont
+    réunies dans un même groupe de doublons, dont seule la première occurrence est conservée.
+
+    Parameters:
+    - keys (list): Les clés normalisées, sans doublons exacts.
+    - threshold (float): Le ratio de similarité (difflib) à partir duquel deux clés
+      sont des doublons.
+    - window (int): Le nombre de voisins comparés à chaque clé.
+
+    Returns:
+    - list: Pour chaque clé, True si elle est conservée.
+    """
+    parent = list(range(len(keys)))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    blocks = {}
+    for index, key in enumerate(keys):
+        blocks.setdefault(key[:1], []).append(index)
+
+    matcher = SequenceMatcher(autojunk=False)
+    for indexes in blocks.values():
+        indexes.sort(key=keys.__getitem__)
+        for position, index in enumerate(indexes):
+            matcher.set_seq2(keys[index])
+            for other in indexes[max(0, position - window):position]:
+                matcher.set_seq1(keys[other])
+                if matcher.real_quick_ratio() >= threshold \
+                        and matcher.quick_ratio() >= threshold \
+                        and matcher.ratio() >= threshold:
+                    # La racine d'un groupe est toujours sa première occurrence
+                    root, other_root = find(index), find(other)
+                    parent[max(root, other_root)] = min(root, other_root)
+
+    return [find(index) == index for index in range(len(keys))]
+
+
+def dedupe(data, near_threshold=None, window=4):
+    """
+    Supprime les doublons d'un DataFrame de fromages selon le nom normalisé,
+    en conservant la première occurrence.
+
+    Les clés normalisées sont calculées une seule fois, puis servent au passage exact
+    et, si near_threshold est précisé, au passage des quasi-doublons.
+
+    Parameters:
+    - data (pd.DataFrame): Les données, avec la colonne 'fromage_names'.
+    - near_threshold (float): Le seuil de similarité du passage des quasi-doublons,
+      ou None pour ne faire que le passage exact.
+    - window (int): Le nombre de voisins comparés par le passage des quasi-doublons.
+
+    Returns:
+    - tuple: Le DataFrame dédoublonné (index renuméroté) et la liste des étapes, chacune
+      sous forme de dict avec les clés 'stage', 'rows_in', 'rows_out' et 'seconds'.
+    """
+    report = []
+
+    start = time.perf_counter()
+    names = data['fromage_names'].tolist()
+    # Chaque nom distinct n'est normalisé qu'une fois
+    normalised = {name: normalise_key(name) for name in set(names)}
+    keys = [normalised[name] for name in names]
+    report.append({'stage': 'normalise', 'rows_in': len(keys), 'rows_out': len(keys),
+                   'seconds': time.perf_counter() - start})
+
+    start = time.perf_counter()
+    keep = exact_duplicates(keys)
+    data = data[keep]
+    keys = [key for key, kept in zip(keys, keep) if kept]
+    report.append({'stage': 'exact', 'rows_in': len(keep), 'rows_out': len(keys),
+                   'seconds': time.perf_counter() - start})
+
+    if near_threshold is not None:
+        start = time.perf_counter()
+        keep = near_duplicates(keys, near_threshold, window)
+        data = data[keep]
+        report.append({'stage': 'near', 'rows_in': len(keys), 'rows_out': len(data),
+                       'seconds': time.perf_counter() - start})
+
+    return data.reset_index(drop=True), report
+
@@ -0,0 +1,273 @@
+"""
+Ce module contient le stockage versionné de la table des fromages.
+"""
+import numbers
+import sqlite3
+from collections import Counter
+from datetime import date, datetime, time
+
+import pandas as pd
+
+COLUMNS = ['fromage_names', 'fromage_familles', 'pates']
+
+
+def bump_generation(con, table_name):
+    """
+    Incrémente le numéro de génération d'une table après un chargement.
+    Les lecteurs (le service HTTP par exemple) s'en servent pour savoir
+    si le contenu a changé sans relire la table. Tout écrivain l'appelle
+    dans la transaction du chargement, avant le commit.
+
+    Parameters:
+    - con (sqlite3.Connection): La connexion à la base de données.
+    - table_name (str): Le nom de la table chargée.
+    """
+    con.execute("CREATE TABLE IF NOT EXISTS etl_generations ("
+                "table_name TEXT PRIMARY KEY, generation INTEGER NOT NULL)")
+    con.execute("INSERT INTO etl_generations VALUES (?, 1) ON CONFLICT (table_name) "
+                "DO UPDATE SET generation = generation + 1", (table_name,))
+
+
+class FromageHistory:
+    """
+    Un stockage versionné de la table des fromages dans SQLite.
+
+    Chaque chargement crée un lot (batch) numéroté. Une ligne de l'historique porte le lot
+    à partir duquel elle est valide (valid_from) et celui à partir duquel elle ne l'est plus
+    (valid_to, NULL tant qu'elle est présente) : une ligne inchangée entre deux chargements
+    n'est jamais dupliquée, la taille de l'historique croît donc avec les changements.
+
+    Trois objets sont créés dans la base :
+    - `<table>_history` : l'historique des lignes ;
+    - `<table>_batches` : la date de chaque chargement ;
+    - `<table>` : une vue de l'état courant, avec les mêmes colonnes qu'un chargement
+      classique de FromageETL, pour que les lectures existantes fonctionnent sans changement.
+
+    Attributes :
+    - database_name (str) : Le nom de la base de données SQLite.
+    - table_name (str) : Le nom de la vue de l'état courant.
+    """
+
+    def __init__(self, database_name, table_name):
+        """
+        Initialise une instance de la classe FromageHistory.
+
+        La base n'est pas modifiée : les tables et la vue sont créées au premier chargement,
+        les lectures laissent donc le schéma intact.
+
+        Parameters:
+        - database_name (str): Le nom de la base de données SQLite.
+        - table_name (str): Le nom de la vue de l'état courant.
+        """
+        self.database_name = database_name
+        self.table_name = table_name
+        self.history_name = f"{table_name}_history"
+        self.batches_name = f"{table_name}_batches"
+
+    def _create_schema(self, con):
+        """
+        Crée les tables, les index et la vue si besoin.
+
+        Parameters:
+        - con (sqlite3.Connection): La connexion à la base de données.
+
+        Raises:
+        - ValueError: Si la table existe déjà sans historique.
+        """
+        existing = con.execute("SELECT type FROM sqlite_master WHERE name = ?",
+                               (self.table_name,)).fetchone()
+        if existing is not None and existing[0] != 'view':
+            raise ValueError(f"{self.table_name} est déjà une table non versionnée")
+        con.executescript(f"""
+            CREATE TABLE IF NOT EXISTS {self.batches_name} (
+                batch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                loaded_at TEXT NOT NULL);
+            CREATE INDEX IF NOT EXISTS {self.batches_name}_loaded_at_idx
+                ON {self.batches_name} (loaded_at);
+            CREATE TABLE IF NOT EXISTS {self.history_name} (
+                row_id INTEGER PRIMARY KEY,
+                fromage_names TEXT, fromage_familles TEXT, pates TEXT,
+                valid_from INTEGER NOT NULL, valid_to INTEGER);
+            CREATE INDEX IF NOT EXISTS {self.history_name}_validity_idx
+                ON {self.history_name} (valid_to, valid_from);
+            CREATE VIEW IF NOT EXISTS {self.table_name} AS
+                SELECT h.fromage_names, h.fromage_familles, h.pates,
+                       b.loaded_at AS creation_date
+                FROM {self.history_name} h
+                JOIN {self.batches_name} b ON b.batch_id = h.valid_from
+                WHERE h.valid_to IS NULL
+                ORDER BY h.row_id;
+        """)
+
+    def _connect(self):
+        """
+        Ouvre une connexion en lecture sur un historique existant.
+
+        Returns:
+        - sqlite3.Connection: La connexion à la base de données.
+
+        Raises:
+        - ValueError: Si la table n'a jamais été chargée en mode versionné.
+        """
+        con = sqlite3.connect(self.database_name)
+        existing = con.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                               (self.history_name,)).fetchone()
+        if existing is None:
+            con.close()
+            raise ValueError(f"{self.table_name} n'est pas une table versionnée")
+        return con
+
+    def load(self, data, loaded_at=None):
+        """
+        Enregistre un nouvel état complet de la table sous forme d'un nouveau lot.
+
+        Seules les différences avec l'état courant sont écrites : les lignes disparues sont
+        fermées (valid_to) et les nouvelles lignes insérées. Les doublons exacts sont comptés,
+        une ligne présente deux fois reste donc présente deux fois.
+
+        Parameters:
+        - data (pd.DataFrame): Les données, avec les colonnes 'fromage_names',
+          'fromage_familles' et 'pates'.
+        - loaded_at (datetime): La date du chargement, maintenant par défaut.
+
+        Returns:
+        - int: Le numéro du lot créé.
+
+        Raises:
+        - ValueError: Si la table existe déjà sans historique.
+        """
+        loaded_at = loaded_at or datetime.now()
+        con = sqlite3.connect(self.database_name)
+        try:
+            self._create_schema(con)
+        except ValueError:
+            con.close()
+            raise
+        with con:
+            batch_id = con.execute(f"INSERT INTO {self.batches_name} (loaded_at) VALUES (?)",
+                                   (loaded_at.isoformat(),)).lastrowid
+
+            current = {}
+            for row_id, *key in con.execute(
+                    f"SELECT row_id, {', '.join(COLUMNS)} FROM {self.history_name} "
+                    f"WHERE valid_to IS NULL"):
+                current.setdefault(tuple(key), []).append(row_id)
+
+            incoming = Counter(data[COLUMNS].itertuples(index=False, name=None))
+            to_close = []
+            to_insert = []
+            for key, count in incoming.items():
+                row_ids = current.pop(key, [])
+                to_close.extend(row_ids[count:])
+                to_insert.extend([key] * (count - len(row_ids)))
+            for row_ids in current.values():
+                to_close.extend(row_ids)
+
+            con.executemany(f"UPDATE {self.history_name} SET valid_to = ? WHERE row_id = ?",
+                            [(batch_id, row_id) for row_id in to_close])
+            con.executemany(f"INSERT INTO {self.history_name} "
+                            f"({', '.join(COLUMNS)}, valid_from) VALUES (?, ?, ?, ?)",
+                            [(*key, batch_id) for key in to_insert])
+            bump_generation(con, self.table_name)
+        con.close()
+        return batch_id
+
+    def resolve_batch(self, as_of):
+        """
+        Retourne le lot en vigueur à une date ou un numéro de lot donné.
+
+        Parameters:
+        - as_of (int | datetime | date | str): Un numéro de lot, ou une date (le dernier lot
+          chargé à cette date est retenu). Une chaîne est lue au format ISO 8601, avec 'T'
+          ou une espace entre la date et l'heure ; une date sans heure ('2024-01-01' ou un
+          objet date) désigne la fin de cette journée.
+
+        Returns:
+        - int: Le numéro du lot, ou None si aucun lot n'était chargé à cette date.
+
+        Raises:
+        - TypeError: Si as_of n'est ni un entier, ni une date, ni une chaîne.
+        - ValueError: Si la chaîne n'est pas une date ISO 8601.
+        """
+        if isinstance(as_of, numbers.Integral) and not isinstance(as_of, bool):
+            return int(as_of)
+        if isinstance(as_of, str):
+            try:
+                as_of = date.fromisoformat(as_of)
+            except ValueError:
+                as_of = datetime.fromisoformat(as_of)
+        if isinstance(as_of, date) and not isinstance(as_of, datetime):
+            as_of = datetime.combine(as_of, time.max)
+        if not isinstance(as_of, datetime):
+            raise TypeError("as_of doit être un numéro de lot ou une date, "
+                            f"pas {type(as_of).__name__}")
+        # loaded_at est écrit par datetime.isoformat : la comparaison de texte suit l'ordre chronologique
+        con = self._connect()
+        row = con.execute(f"SELECT MAX(batch_id) FROM {self.batches_name} WHERE loaded_at <= ?",
+                          (as_of.isoformat(),)).fetchone()
+        con.close()
+        return row[0]
+
+    def read(self, as_of=None):
+        """
+        Lit l'état de la table, courant ou à un lot ou une date passés.
+
+        Les lignes encore présentes (valid_to IS NULL) et celles fermées après le lot voulu
+        (valid_to > lot) sont lues séparément, chacune par l'index (valid_to, valid_from),
+        puis remises dans l'ordre d'insertion.
+
+        Parameters:
+        - as_of (int | datetime | str): Le lot ou la date voulus, l'état courant par défaut.
+
+        Returns:
+        - pd.DataFrame: Un DataFrame avec les colonnes 'fromage_names', 'fromage_familles',
+          'pates' et 'creation_date' (date du lot où la ligne est apparue).
+
+        Raises:
+        - ValueError: Si la table n'a jamais été chargée en mode versionné.
+        """
+        if as_of is None:
+            con = self._connect()
+            data = pd.read_sql_query(f"SELECT * FROM {self.table_name}", con)
+            con.close()
+            return data
+
+        batch_id = self.resolve_batch(as_of)
+        con = self._connect()
+        data = pd.read_sql_query(
+            self._as_of_query(),
+            con, params={'batch': -1 if batch_id is None else batch_id})
+        con.close()
+        return (data.sort_values('row_id', kind='stable')
+                .drop(columns='row_id')
+                .reset_index(drop=True))
+
+    def _as_of_query(self):
+        """
+        Retourne la requête de lecture d'un lot passé, paramétrée par :batch.
+
+        Returns:
+        - str: La requête SQL, avec la colonne row_id en plus pour l'ordre d'insertion.
+        """
+        select = (f"SELECT h.row_id, h.fromage_names, h.fromage_familles, h.pates, "
+                  f"b.loaded_at AS creation_date "
+                  f"FROM {self.history_name} h "
+                  f"JOIN {self.batches_name} b ON b.batch_id = h.valid_from ")
+        return (f"{select} WHERE h.valid_to IS NULL AND h.valid_from <= :batch "
+                f"UNION ALL "
+                f"{select} WHERE h.valid_to > :batch AND h.valid_from <= :batch")
+
+    def batches(self):
+        """
+        Liste les lots chargés.
+
+        Returns:
+        - pd.DataFrame: Un DataFrame avec les colonnes 'batch_id' et 'loaded_at'.
+
+        Raises:
+        - ValueError: Si la table n'a jamais été chargée en mode versionné.
+        """
+        con = self._connect()
+        data = pd.read_sql_query(f"SELECT * FROM {self.batches_name} ORDER BY batch_id", con)
+        con.close()
+        return data
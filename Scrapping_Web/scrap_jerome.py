@@ -2,6 +2,8 @@
 Ce module contient les importations nécessaires pour le script.
 """
 import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from urllib.request import urlopen
 from bs4 import BeautifulSoup
@@ -9,6 +11,98 @@ from bs4 import BeautifulSoup
 
 import pandas as pd
 
+from dedupe import dedupe as dedupe_fromages
+from history import FromageHistory, bump_generation
+from stats import FromageStats
+
+
+def parse_page(html):
+    """
+    Analyse une page HTML et récupère les informations sur les fromages
+    à partir de la première table HTML.
+
+    Cette fonction ne dépend d'aucune instance afin de pouvoir être exécutée
+    dans un pool de processus.
+
+    Parameters:
+    - html (bytes): Le contenu brut de la page, ou un BeautifulSoup déjà analysé.
+
+    Returns:
+    - tuple: Trois listes ('fromage_names', 'fromage_familles', 'pates') de même longueur.
+    """
+    soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, 'html.parser')
+    cheese_dish = soup.find('table')
+
+    fromage_names = []
+    fromage_familles = []
+    pates = []
+
+    # Une page sans table (page d'index par exemple) ne contient aucun fromage
+    if cheese_dish is None:
+        return fromage_names, fromage_familles, pates
+
+    for row in cheese_dish.find_all('tr'):
+        columns = row.find_all('td')
+
+        # Ignore les lignes d'en-tête en <th> et celles de moins de trois colonnes
+        if len(columns) < 3 or columns[0].text.strip() == "Fromage":
+            continue
+
+        if columns:
+            fromage_name = columns[0].text.strip()
+            fromage_famille = columns[1].text.strip()
+            pate = columns[2].text.strip()
+
+            # Ignore les lignes vides
+            if fromage_name != '' and fromage_famille != '' and pate != '':
+                fromage_names.append(fromage_name)
+                fromage_familles.append(fromage_famille)
+                pates.append(pate)
+
+    return fromage_names, fromage_familles, pates
+
+
+def parse_pages(pages):
+    """
+    Analyse un lot de pages et concatène leurs lignes en un seul lot compact,
+    pour qu'un processus du pool ne renvoie qu'un résultat par lot.
+
+    Parameters:
+    - pages (list): Les contenus bruts des pages.
+
+    Returns:
+    - tuple: Trois listes ('fromage_names', 'fromage_familles', 'pates') de même longueur.
+    """
+    fromage_names = []
+    fromage_familles = []
+    pates = []
+    for page in pages:
+        names, familles, page_pates = parse_page(page)
+        fromage_names.extend(names)
+        fromage_familles.extend(familles)
+        pates.extend(page_pates)
+    return fromage_names, fromage_familles, pates
+
+
+def build_frame(fromage_names, fromage_familles, pates):
+    """
+    Construit le DataFrame des fromages à partir des trois listes renvoyées par parse_page
+    ou parse_pages.
+
+    Parameters:
+    - fromage_names (list): Les noms de fromages.
+    - fromage_familles (list): Les familles, dans le même ordre.
+    - pates (list): Les types de pâte, dans le même ordre.
+
+    Returns:
+    - pd.DataFrame: Un DataFrame avec les colonnes 'fromage_names', 'fromage_familles' et 'pates'.
+    """
+    return pd.DataFrame({
+        'fromage_names': fromage_names,
+        'fromage_familles': fromage_familles,
+        'pates': pates
+    })
+
 
 class FromageETL:
     """
@@ -20,26 +114,58 @@ class FromageETL:
     Attributes :
     - url (str) : L'URL à partir de laquelle les données peuvent être extraites.
     - data (pd.DataFrame) : Un DataFrame pandas contenant les données sur les fromages.
+    - archive (PageArchive) : L'archive des pages brutes, ou None pour ne rien archiver.
+    - check_stats (bool) : Si True, chaque lecture des statistiques est comparée
+      à un recalcul complet (mode de vérification, coûteux).
+    - stage_report (list) : Pour la dernière transformation, une entrée par étape
+      ('stage', 'rows_in', 'rows_out', 'seconds').
     """
 
-    def __init__(self, url):
+    def __init__(self, url, archive=None, check_stats=False):
         """
         Initialise une instance de la classe FromageETL.
 
         Parameters:
         - url (str): L'URL à partir de laquelle les données sur les fromages seront extraites.
+        - archive (PageArchive): Si précisée, chaque page téléchargée y est archivée.
+        - check_stats (bool): Active la vérification des statistiques incrémentales.
         """
         self.url = url
         self.data = None
+        self.archive = archive
+        self.check_stats = check_stats
+        self.stage_report = []
+        # Statistiques incrémentales, valables tant que _stats_source est self.data
+        self._stats = FromageStats()
+        self._stats_source = None
 
     def extract(self):
         """
         Extrait les données à partir de l'URL spécifiée et les stocke dans self.data.
+        Si une archive est configurée, les octets bruts y sont également conservés.
         """
         data = urlopen(self.url)
         self.data = data.read()
+        if self.archive is not None:
+            self.archive.store(self.url, self.data)
 
-    def transform(self):
+    def replay(self, fetched_at=None):
+        """
+        Relit la page depuis l'archive au lieu du réseau et la stocke dans self.data,
+        prête pour transform.
+
+        Parameters:
+        - fetched_at (datetime): Rejoue la dernière récupération antérieure à cette date
+          (la plus récente par défaut).
+        """
+        if self.archive is None:
+            raise ValueError("Aucune archive n'est configurée pour le rejeu")
+        sha256 = self.archive.latest(self.url, fetched_at)
+        if sha256 is None:
+            raise KeyError(f"Aucune page archivée pour {self.url}")
+        self.data = self.archive.load(sha256)
+
+    def transform(self, dedupe=False, near_threshold=None):
         """
         Transforme les données extraites en un DataFrame pandas structuré.
 
@@ -47,63 +173,116 @@ class FromageETL:
         la récupération des informations sur les fromages
         à partir de la table HTML, et la création d'un DataFrame avec les colonnes 'fromage_names', 
         'fromage_familles', 'pates', et 'creation_date'.
+
+        Parameters:
+        - dedupe (bool): Si True, les doublons de noms (casse, espaces, accents) sont supprimés.
+        - near_threshold (float): Avec dedupe, supprime aussi les quasi-doublons dont la
+          similarité dépasse ce seuil (voir dedupe.near_duplicates).
         """
-        soup = BeautifulSoup(self.data, 'html.parser')
-        cheese_dish = soup.find('table')
+        start = time.perf_counter()
+        fromage_names, fromage_familles, pates = parse_page(self.data)
+        self.stage_report = [{'stage': 'parse', 'rows_in': len(fromage_names),
+                              'rows_out': len(fromage_names),
+                              'seconds': time.perf_counter() - start}]
+        self._build_frame(fromage_names, fromage_familles, pates, dedupe, near_threshold)
 
-        fromage_names = []
-        fromage_familles = []
-        pates = []
+    def transform_many(self, pages, max_workers=None, chunksize=8, dedupe=False,
+                       near_threshold=None):
+        """
+        Transforme plusieurs pages en un seul DataFrame pandas, en répartissant
+        l'analyse HTML sur un pool de processus.
 
-        for row in cheese_dish.find_all('tr'):
-            columns = row.find_all('td')
+        Les pages sont envoyées par lots de `chunksize` pour amortir la sérialisation ;
+        chaque lot renvoie trois listes, concaténées une seule fois à la fin.
 
-            if columns[0].text.strip() == "Fromage":
-                continue
+        Parameters:
+        - pages (list): Les contenus bruts des pages, dans l'ordre voulu des lignes.
+        - max_workers (int): Le nombre de processus, le nombre de cœurs par défaut.
+          Avec 1, l'analyse est faite dans le processus courant.
+        - chunksize (int): Le nombre de pages par lot envoyé à un processus.
+        - dedupe (bool): Si True, les doublons de noms sont supprimés (voir transform).
+        - near_threshold (float): Avec dedupe, le seuil des quasi-doublons (voir transform).
+        """
+        start = time.perf_counter()
+        pages = list(pages)
+        chunks = [pages[i:i + chunksize] for i in range(0, len(pages), chunksize)]
+        if max_workers == 1:
+            batches = map(parse_pages, chunks)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                batches = list(executor.map(parse_pages, chunks))
 
-            if columns:
-                fromage_name = columns[0].text.strip()
-                fromage_famille = columns[1].text.strip()
-                pate = columns[2].text.strip()
+        fromage_names = []
+        fromage_familles = []
+        pates = []
+        for names, familles, batch_pates in batches:
+            fromage_names.extend(names)
+            fromage_familles.extend(familles)
+            pates.extend(batch_pates)
 
-                # Ignore les lignes vides
-                if fromage_name != '' and fromage_famille != '' and pate != '':
-                    fromage_names.append(fromage_name)
-                    fromage_familles.append(fromage_famille)
-                    pates.append(pate)
+        self.stage_report = [{'stage': 'parse', 'rows_in': len(fromage_names),
+                              'rows_out': len(fromage_names),
+                              'seconds': time.perf_counter() - start}]
+        self._build_frame(fromage_names, fromage_familles, pates, dedupe, near_threshold)
 
-        self.data = pd.DataFrame({
-            'fromage_names': fromage_names,
-            'fromage_familles': fromage_familles,
-            'pates': pates
-        })
+    def _build_frame(self, fromage_names, fromage_familles, pates, dedupe, near_threshold):
+        """
+        Construit self.data à partir des lignes analysées, en les dédoublonnant si demandé,
+        puis recalcule les statistiques.
+        """
+        self.data = build_frame(fromage_names, fromage_familles, pates)
+        if dedupe:
+            self.data, report = dedupe_fromages(self.data, near_threshold)
+            self.stage_report.extend(report)
 
         self.data['creation_date'] = datetime.now()
+        self._rebuild_stats()
 
-    def load(self, database_name, table_name):
+    def load(self, database_name, table_name, versioned=False):
         """
         Charge les données dans une table SQLite spécifiée.
 
         Parameters:
         - database_name (str): Le nom de la base de données SQLite.
         - table_name (str): Le nom de la table dans laquelle charger les données.
+        - versioned (bool): Si True, les données sont ajoutées comme un nouveau lot de
+          l'historique (voir FromageHistory) au lieu de remplacer la table.
+
+        Raises:
+        - ValueError: Si la table est versionnée et versioned est False, ou l'inverse.
         """
+        if versioned:
+            FromageHistory(database_name, table_name).load(self.data)
+            return self.data
+
         con = sqlite3.connect(database_name)
+        existing = con.execute("SELECT type FROM sqlite_master WHERE name = ?",
+                               (table_name,)).fetchone()
+        if existing is not None and existing[0] == 'view':
+            con.close()
+            raise ValueError(f"{table_name} est une table versionnée, "
+                             "utilisez load(..., versioned=True)")
         self.data.to_sql(table_name, con, if_exists="replace", index=False)
+        bump_generation(con, table_name)
+        con.commit()
         con.close()
         return self.data
 
-    def read_from_database(self, database_name, table_name):
+    def read_from_database(self, database_name, table_name, as_of=None):
         """
         Lit les données à partir d'une table SQLite spécifiée.
 
         Parameters:
         - database_name (str): Le nom de la base de données SQLite.
         - table_name (str): Le nom de la table à lire.
+        - as_of (int | datetime | str): Pour une table versionnée, le lot ou la date
+          dont on veut l'état (l'état courant par défaut).
 
         Returns:
         - pd.DataFrame: Un DataFrame contenant les données de la table.
         """
+        if as_of is not None:
+            return FromageHistory(database_name, table_name).read(as_of)
         con = sqlite3.connect(database_name)
         data_from_db = pd.read_sql_query(f"SELECT * from {table_name}", con)
         con.close()
@@ -181,19 +360,29 @@ class FromageETL:
         """
         new_row = pd.DataFrame({'fromage_names': [fromage_name],
             'fromage_familles': [fromage_famille], 'pates': [pate]})
+        tracked = self._stats_source is self.data
         self.data = pd.concat([self.data, new_row], ignore_index=True)
+        if tracked:
+            self._stats.add(fromage_name, fromage_famille, pate)
+            self._stats_source = self.data
 
     def sort_ascending(self):
         """
         Trie l'ensemble de données par ordre croissant des noms de fromages.
         """
+        tracked = self._stats_source is self.data
         self.data = self.data.sort_values(by=['fromage_names'])
+        if tracked:
+            self._stats_source = self.data
 
     def sort_descending(self):
         """
         Trie l'ensemble de données par ordre décroissant des noms de fromages.
         """
+        tracked = self._stats_source is self.data
         self.data = self.data.sort_values(by=['fromage_names'], ascending=False)
+        if tracked:
+            self._stats_source = self.data
 
     def total_count(self):
         """
@@ -202,16 +391,67 @@ class FromageETL:
         Returns:
         - int: Nombre total de lignes.
         """
-        return len(self.data)
+        return self._current_stats().total
 
-    def count_by_letter(self):
+    def count_by_letter(self, normalise=False):
         """
         Compte le nombre de fromages par lettre initiale dans les noms.
 
+        Parameters:
+        - normalise (bool): Si True, les lettres sont regroupées sans tenir compte
+          des accents ni de la casse ('É', 'e' et 'E' comptent pour 'E').
+
         Returns:
         - pd.Series: Série contenant le décompte des fromages par lettre initiale.
         """
-        return self.data['fromage_names'].str[0].value_counts()
+        return self._current_stats().letter_counts(normalise)
+
+    def count_by_famille(self):
+        """
+        Compte le nombre de fromages par famille.
+
+        Returns:
+        - pd.Series: Série contenant le décompte des fromages par famille.
+        """
+        return self._current_stats().famille_counts()
+
+    def count_by_pate(self):
+        """
+        Compte le nombre de fromages par type de pâte.
+
+        Returns:
+        - pd.Series: Série contenant le décompte des fromages par type de pâte.
+        """
+        return self._current_stats().pate_counts()
+
+    def verify_stats(self):
+        """
+        Compare les statistiques incrémentales à un recalcul complet de l'ensemble de données.
+
+        Returns:
+        - bool: True si les statistiques sont cohérentes.
+        """
+        expected = FromageStats()
+        expected.rebuild(self.data)
+        return self._stats_source is self.data and self._stats == expected
+
+    def _rebuild_stats(self):
+        """
+        Recalcule les statistiques incrémentales à partir de self.data.
+        """
+        self._stats.rebuild(self.data)
+        self._stats_source = self.data
+
+    def _current_stats(self):
+        """
+        Retourne les statistiques à jour, en les recalculant une seule fois si self.data
+        a été remplacé en dehors des méthodes de la classe.
+        """
+        if self._stats_source is not self.data:
+            self._rebuild_stats()
+        elif self.check_stats and not self.verify_stats():
+            raise RuntimeError("Les statistiques incrémentales sont incohérentes avec les données")
+        return self._stats
 
     def update_fromage_name(self, old_name, new_name):
         """
@@ -221,7 +461,10 @@ class FromageETL:
         - old_name (str): Ancien nom du fromage à mettre à jour.
         - new_name (str): Nouveau nom à attribuer au fromage.
         """
-        self.data.loc[self.data.fromage_names == old_name, 'fromage_names'] = new_name
+        mask = self.data.fromage_names == old_name
+        self.data.loc[mask, 'fromage_names'] = new_name
+        if self._stats_source is self.data:
+            self._stats.rename(old_name, new_name, int(mask.sum()))
 
     def delete_row(self, fromage_name):
         """
@@ -230,7 +473,15 @@ class FromageETL:
         Parameters:
         - fromage_name (str): Nom du fromage à supprimer.
         """
-        self.data = self.data[self.data.fromage_names != fromage_name]
+        mask = self.data.fromage_names == fromage_name
+        tracked = self._stats_source is self.data
+        if tracked:
+            removed = self.data.loc[mask, ['fromage_familles', 'pates']]
+            for (fromage_famille, pate), count in removed.value_counts(dropna=False).items():
+                self._stats.remove(fromage_name, fromage_famille, pate, count)
+        self.data = self.data[~mask]
+        if tracked:
+            self._stats_source = self.data
 
     def group_and_count_by_first_letter(self, database_name, table_name):
         """
@@ -255,13 +506,14 @@ class FromageETL:
 
         return grouped_data
 
-# Utilisation de la classe
-A = 'https://www.laboitedufromager.com/liste-des-fromages-par-ordre-alphabetique/'
-fromage_etl = FromageETL(A)
-fromage_etl.extract()
-fromage_etl.transform()
-fromage_etl.load('fromages_bdd.sqlite', 'fromages_table')
-data_from_db_external = fromage_etl.read_from_database('fromages_bdd.sqlite', 'fromages_table')
-
-# Afficher le DataFrame
-print(data_from_db_external)
\ No newline at end of file
+if __name__ == '__main__':
+    # Utilisation de la classe
+    A = 'https://www.laboitedufromager.com/liste-des-fromages-par-ordre-alphabetique/'
+    fromage_etl = FromageETL(A)
+    fromage_etl.extract()
+    fromage_etl.transform()
+    fromage_etl.load('fromages_bdd.sqlite', 'fromages_table')
+    data_from_db_external = fromage_etl.read_from_database('fromages_bdd.sqlite', 'fromages_table')
+
+    # Afficher le DataFrame
+    print(data_from_db_external)
@@ -0,0 +1,409 @@
+"""
+Ce module contient un service HTTP/JSON en lecture seule sur la base des fromages.
+
+Usage:
+    python service.py fromages_bdd.sqlite --port 8000
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import zlib
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from dedupe import normalise_key
+
+COLUMNS = ['fromage_names', 'fromage_familles', 'pates']
+STATS_COLUMNS = {
+    'familles': 'fromage_familles',
+    'pates': 'pates',
+    'lettres': 'substr(fromage_names, 1, 1)',
+}
+# Taille des lots lus dans SQLite et écrits dans la réponse en flux
+STREAM_BATCH = 500
+
+
+class ConnectionPool:
+    """
+    Un ensemble de connexions SQLite en lecture seule, réutilisées d'une requête à l'autre
+    au lieu d'ouvrir la base à chaque requête.
+
+    Attributes :
+    - database_name (str) : Le nom de la base de données SQLite.
+    """
+
+    def __init__(self, database_name):
+        """
+        Initialise une instance de la classe ConnectionPool.
+
+        Parameters:
+        - database_name (str): Le nom de la base de données SQLite.
+        """
+        self.database_name = str(database_name)
+        self._idle = queue.LifoQueue()
+
+    @contextmanager
+    def connection(self):
+        """
+        Prête une connexion le temps d'un bloc `with`, puis la remet dans le pool.
+        """
+        try:
+            con = self._idle.get_nowait()
+        except queue.Empty:
+            con = sqlite3.connect(f"file:{self.database_name}?mode=ro", uri=True,
+                                  check_same_thread=False)
+            # LIKE ne replie la casse que pour l'ASCII : la recherche compare les clés
+            # normalisées (sans accent ni casse) du module dedupe
+            con.create_function("normalise_key", 1, normalise_key, deterministic=True)
+        try:
+            yield con
+        finally:
+            self._idle.put(con)
+
+    def close(self):
+        """
+        Ferme toutes les connexions inactives.
+        """
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class FromageService:
+    """
+    Un service HTTP en lecture seule sur une table de fromages, servi par un
+    ThreadingHTTPServer de la bibliothèque standard.
+
+    Points d'accès (réponses JSON) :
+    - /fromages?famille=&pate=&lettre=&limit=&offset= : les lignes filtrées, en flux ;
+    - /search?q=&limit= : les fromages dont le nom contient q (sans tenir compte de la casse
+      ni des accents) ;
+    - /stats/familles, /stats/pates, /stats/lettres : les décomptes par groupe ;
+    - /count : le nombre total de lignes.
+
+    Chaque réponse porte un ETag faible lié à la génération de chargement de la table
+    (voir bump_generation) : un client qui renvoie If-None-Match reçoit 304, sans que la table
+    soit relue, tant qu'elle n'a pas été rechargée. Les réponses sont compressées en gzip
+    si le client l'accepte. Une erreur SQLite (table absente par exemple) donne une réponse
+    503 avec un message JSON.
+
+    Attributes :
+    - table_name (str) : Le nom de la table servie.
+    - pool (ConnectionPool) : Les connexions SQLite réutilisées.
+    - server (ThreadingHTTPServer) : Le serveur HTTP.
+    """
+
+    def __init__(self, database_name, table_name="fromages_table", host="127.0.0.1", port=8000):
+        """
+        Initialise une instance de la classe FromageService.
+
+        Parameters:
+        - database_name (str): Le nom de la base de données SQLite.
+        - table_name (str): Le nom de la table servie.
+        - host (str): L'adresse d'écoute.
+        - port (int): Le port d'écoute (0 pour un port libre).
+        """
+        self.database_name = str(database_name)
+        self.table_name = table_name
+        self.pool = ConnectionPool(database_name)
+        self.server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        """
+        L'URL de base du service.
+        """
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        Démarre le service dans un thread d'arrière-plan.
+        """
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Arrête le service et ferme les connexions.
+        """
+        self.server.shutdown()
+        self.server.server_close()
+        self.pool.close()
+
+    def generation(self, con):
+        """
+        Retourne la génération de chargement de la table.
+
+        Si la table n'a jamais été chargée par une version qui tient ce compteur,
+        la date de modification du fichier de la base en tient lieu.
+
+        Parameters:
+        - con (sqlite3.Connection): Une connexion à la base.
+
+        Returns:
+        - str: La génération courante.
+        """
+        try:
+            row = con.execute("SELECT generation FROM etl_generations WHERE table_name = ?",
+                              (self.table_name,)).fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        if row is not None:
+            return str(row[0])
+        return f"m{os.stat(self.database_name).st_mtime_ns}"
+
+    def rows(self, con, params):
+        """
+        Exécute la requête de /fromages et retourne le curseur des lignes.
+
+        Parameters:
+        - con (sqlite3.Connection): Une connexion à la base.
+        - params (dict): Les paramètres de la requête.
+
+        Returns:
+        - sqlite3.Cursor: Le curseur des lignes filtrées.
+        """
+        conditions = []
+        values = []
+        if 'famille' in params:
+            conditions.append("fromage_familles = ?")
+            values.append(params['famille'])
+        if 'pate' in params:
+            conditions.append("pates = ?")
+            values.append(params['pate'])
+        if 'lettre' in params:
+            conditions.append("substr(fromage_names, 1, 1) = ?")
+            values.append(params['lettre'])
+        query = f"SELECT {', '.join(COLUMNS)} FROM {self.table_name}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " LIMIT ? OFFSET ?"
+        values += [_int_param(params, 'limit', -1), _int_param(params, 'offset', 0)]
+        return con.execute(query, values)
+
+    def search(self, con, params):
+        """
+        Exécute la requête de /search et retourne le curseur des lignes.
+
+        La recherche ignore la casse et les accents ('epo' trouve 'Époisses') :
+        q et les noms sont comparés par leur clé normalisée (voir dedupe.normalise_key).
+
+        Parameters:
+        - con (sqlite3.Connection): Une connexion à la base.
+        - params (dict): Les paramètres de la requête, dont 'q'.
+
+        Returns:
+        - sqlite3.Cursor: Le curseur des lignes trouvées.
+        """
+        if not params.get('q'):
+            raise ValueError("Le paramètre q est obligatoire")
+        pattern = "%" + normalise_key(params['q']).replace("\\", "\\\\").replace("%", "\\%") \
+            .replace("_", "\\_") + "%"
+        return con.execute(
+            f"SELECT {', '.join(COLUMNS)} FROM {self.table_name} "
+            f"WHERE normalise_key(fromage_names) LIKE ? ESCAPE '\\' LIMIT ?",
+            (pattern, _int_param(params, 'limit', 100)))
+
+    def stats(self, con, group):
+        """
+        Retourne les décomptes de /stats/<group>.
+
+        Parameters:
+        - con (sqlite3.Connection): Une connexion à la base.
+        - group (str): 'familles', 'pates' ou 'lettres'.
+
+        Returns:
+        - dict: Le décompte par valeur, du plus grand au plus petit.
+        """
+        column = STATS_COLUMNS[group]
+        return dict(con.execute(
+            f"SELECT {column}, COUNT(*) FROM {self.table_name} "
+            f"GROUP BY {column} ORDER BY COUNT(*) DESC, {column}"))
+
+    def count(self, con):
+        """
+        Retourne le nombre total de lignes pour /count.
+
+        Parameters:
+        - con (sqlite3.Connection): Une connexion à la base.
+
+        Returns:
+        - dict: {'total': nombre de lignes}.
+        """
+        return {'total': con.execute(f"SELECT COUNT(*) FROM {self.table_name}").fetchone()[0]}
+
+
+def _int_param(params, name, default):
+    """
+    Lit un paramètre entier positif ou nul, ou retourne la valeur par défaut.
+    """
+    if name not in params:
+        return default
+    value = int(params[name])
+    if value < 0:
+        raise ValueError(f"Le paramètre {name} doit être positif")
+    return value
+
+
+def _handler_for(service):
+    """
+    Construit la classe de gestionnaire HTTP liée à un service.
+    """
+
+    class FromageHandler(BaseHTTPRequestHandler):
+        """
+        Gestionnaire des requêtes HTTP du service des fromages.
+        """
+        protocol_version = "HTTP/1.1"
+        # Les en-têtes et le corps partent en plusieurs envois : avec l'algorithme de Nagle,
+        # le second attendrait l'acquittement différé du client (~40 ms par requête)
+        disable_nagle_algorithm = True
+        # Vrai dès que les en-têtes d'une réponse en flux sont envoyés
+        _streaming = False
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            """
+            Répond à une requête GET.
+            """
+            parts = urlsplit(self.path)
+            params = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+            path = parts.path.rstrip('/')
+            if path not in ('/fromages', '/search', '/count') \
+                    and path.removeprefix('/stats/') not in STATS_COLUMNS:
+                self._send_json(404, {'error': f"Chemin inconnu : {parts.path}"})
+                return
+
+            self._streaming = False
+            try:
+                with service.pool.connection() as con:
+                    # ETag faible : le même contenu est servi compressé ou non
+                    digest = hashlib.sha1(self.path.encode('utf-8')).hexdigest()[:16]
+                    tag = f'"{service.generation(con)}-{digest}"'
+                    etag = f"W/{tag}"
+                    if tag in self.headers.get('If-None-Match', ''):
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    if path == '/fromages':
+                        self._stream_rows(service.rows(con, params), etag)
+                    elif path == '/search':
+                        self._stream_rows(service.search(con, params), etag)
+                    elif path == '/count':
+                        self._send_json(200, service.count(con), etag)
+                    else:
+                        self._send_json(200, service.stats(con, path.removeprefix('/stats/')),
+                                        etag)
+            except ValueError as error:
+                self._send_json(400, {'error': str(error)})
+            except sqlite3.Error as error:
+                if self._streaming:
+                    # Les en-têtes sont partis : la réponse tronquée est signalée
+                    # au client par la fermeture de la connexion
+                    self.close_connection = True
+                    return
+                self._send_json(503, {'error': f"Base indisponible : {error}"})
+
+        def _accepts_gzip(self):
+            """
+            Indique si le client accepte les réponses compressées en gzip.
+            """
+            return 'gzip' in self.headers.get('Accept-Encoding', '')
+
+        def _send_headers(self, status, etag):
+            """
+            Envoie la ligne de statut et les en-têtes communs.
+            """
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+            if etag:
+                self.send_header("ETag", etag)
+
+        def _send_json(self, status, payload, etag=None):
+            """
+            Envoie une réponse JSON complète, avec sa longueur.
+            """
+            body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+            self._send_headers(status, etag)
+            if self._accepts_gzip():
+                body = gzip.compress(body)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream_rows(self, cursor, etag):
+            """
+            Envoie les lignes d'un curseur sous forme de tableau JSON, en flux
+            (Transfer-Encoding: chunked), sans construire toute la réponse en mémoire.
+            """
+            # La première lecture a lieu avant les en-têtes pour qu'une erreur SQL
+            # donne encore une réponse d'erreur propre
+            batch = cursor.fetchmany(STREAM_BATCH)
+            self._streaming = True
+            self._send_headers(200, etag)
+            compressor = None
+            if self._accepts_gzip():
+                compressor = zlib.compressobj(wbits=31)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            def write(data):
+                if compressor is not None:
+                    data = compressor.compress(data)
+                if data:
+                    self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+
+            write(b"[")
+            first = True
+            while batch:
+                parts = [json.dumps(dict(zip(COLUMNS, row)), ensure_ascii=False)
+                         for row in batch]
+                write(("" if first else ",").encode('utf-8')
+                      + ",".join(parts).encode('utf-8'))
+                first = False
+                batch = cursor.fetchmany(STREAM_BATCH)
+            write(b"]")
+            if compressor is not None:
+                tail = compressor.flush()
+                if tail:
+                    self.wfile.write(f"{len(tail):x}\r\n".encode('ascii') + tail + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+
+        def log_message(self, *args):  # pylint: disable=arguments-differ
+            """
+            Les requêtes ne sont pas journalisées, pour ne pas ralentir le service.
+            """
+
+    return FromageHandler
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('database_name')
+    parser.add_argument('--table', default="fromages_table")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8000)
+    arguments = parser.parse_args()
+    fromage_service = FromageService(arguments.database_name, arguments.table,
+                                     arguments.host, arguments.port)
+    print(f"Service des fromages sur {fromage_service.url}")
+    try:
+        fromage_service.server.serve_forever()
+    except KeyboardInterrupt:
+        fromage_service.stop()
@@ -0,0 +1,195 @@
+"""
+Ce module contient les statistiques incrémentales de l'ensemble de données des fromages.
+"""
+import unicodedata
+from collections import Counter
+
+import pandas as pd
+
+
+def normalise_letter(name):
+    """
+    Retourne la lettre initiale d'un nom sans accent et en majuscule ('é' et 'E' donnent 'E').
+
+    Parameters:
+    - name (str): Le nom du fromage.
+
+    Returns:
+    - str: La lettre normalisée, ou None si le nom est vide.
+    """
+    if not isinstance(name, str) or not name:
+        return None
+    return unicodedata.normalize('NFKD', name[0])[0].upper()
+
+
+def _initial(name):
+    """
+    Retourne la lettre initiale brute d'un nom, ou None si le nom est vide.
+    """
+    if not isinstance(name, str) or not name:
+        return None
+    return name[0]
+
+
+def _is_missing(value):
+    """
+    Indique si une valeur est absente (None ou NaN), comme value_counts qui l'ignore.
+    """
+    return value is None or (isinstance(value, float) and pd.isna(value))
+
+
+class FromageStats:
+    """
+    Des compteurs tenus à jour à chaque modification de l'ensemble de données :
+    nombre total de lignes, et nombre de fromages par lettre initiale (brute et normalisée),
+    par famille et par pâte. Les valeurs absentes (None, NaN) ne sont pas comptées par groupe,
+    comme avec value_counts. La mise à jour des compteurs coûte O(1) par ligne modifiée ;
+    la modification du DataFrame lui-même par FromageETL reste en O(n).
+
+    Attributes :
+    - total (int) : Le nombre total de lignes.
+    - letters (Counter) : Le nombre de fromages par lettre initiale.
+    - normalised_letters (Counter) : Le nombre de fromages par lettre sans accent ni casse.
+    - familles (Counter) : Le nombre de fromages par famille.
+    - pates (Counter) : Le nombre de fromages par type de pâte.
+    """
+
+    def __init__(self):
+        """
+        Initialise des compteurs vides.
+        """
+        self.total = 0
+        self.letters = Counter()
+        self.normalised_letters = Counter()
+        self.familles = Counter()
+        self.pates = Counter()
+
+    def rebuild(self, data):
+        """
+        Recalcule tous les compteurs à partir d'un DataFrame complet.
+
+        Parameters:
+        - data (pd.DataFrame): Les données, ou None pour un ensemble vide.
+        """
+        self.total = 0
+        self.letters = Counter()
+        self.normalised_letters = Counter()
+        self.familles = Counter()
+        self.pates = Counter()
+        if data is None:
+            return
+        names = data['fromage_names'].tolist()
+        self.total = len(names)
+        self.letters.update(_initial(name) for name in names)
+        self.normalised_letters.update(normalise_letter(name) for name in names)
+        self.familles.update(famille for famille in data['fromage_familles'].tolist()
+                             if not _is_missing(famille))
+        self.pates.update(pate for pate in data['pates'].tolist() if not _is_missing(pate))
+        for counter in (self.letters, self.normalised_letters):
+            counter.pop(None, None)
+
+    def add(self, fromage_name, fromage_famille, pate, count=1):
+        """
+        Prend en compte l'ajout de `count` lignes identiques.
+
+        Parameters:
+        - fromage_name (str): Nom du fromage.
+        - fromage_famille (str): Famille du fromage.
+        - pate (str): Type de pâte du fromage.
+        - count (int): Le nombre de lignes ajoutées.
+        """
+        self.total += count
+        self._shift(self.letters, _initial(fromage_name), count)
+        self._shift(self.normalised_letters, normalise_letter(fromage_name), count)
+        self._shift(self.familles, fromage_famille, count)
+        self._shift(self.pates, pate, count)
+
+    def remove(self, fromage_name, fromage_famille, pate, count=1):
+        """
+        Prend en compte la suppression de `count` lignes identiques.
+
+        Parameters:
+        - fromage_name (str): Nom du fromage.
+        - fromage_famille (str): Famille du fromage.
+        - pate (str): Type de pâte du fromage.
+        - count (int): Le nombre de lignes supprimées.
+        """
+        self.add(fromage_name, fromage_famille, pate, -count)
+
+    def rename(self, old_name, new_name, count=1):
+        """
+        Prend en compte le renommage de `count` lignes.
+
+        Parameters:
+        - old_name (str): Ancien nom du fromage.
+        - new_name (str): Nouveau nom du fromage.
+        - count (int): Le nombre de lignes renommées.
+        """
+        self._shift(self.letters, _initial(old_name), -count)
+        self._shift(self.letters, _initial(new_name), count)
+        self._shift(self.normalised_letters, normalise_letter(old_name), -count)
+        self._shift(self.normalised_letters, normalise_letter(new_name), count)
+
+    def letter_counts(self, normalise=False):
+        """
+        Retourne le décompte des fromages par lettre initiale, au format de value_counts.
+
+        Parameters:
+        - normalise (bool): Si True, regroupe les lettres sans tenir compte des accents
+          ni de la casse.
+
+        Returns:
+        - pd.Series: Série triée par décompte décroissant.
+        """
+        return self._as_series(self.normalised_letters if normalise else self.letters,
+                               'fromage_names')
+
+    def famille_counts(self):
+        """
+        Retourne le décompte des fromages par famille, au format de value_counts.
+
+        Returns:
+        - pd.Series: Série triée par décompte décroissant.
+        """
+        return self._as_series(self.familles, 'fromage_familles')
+
+    def pate_counts(self):
+        """
+        Retourne le décompte des fromages par type de pâte, au format de value_counts.
+
+        Returns:
+        - pd.Series: Série triée par décompte décroissant.
+        """
+        return self._as_series(self.pates, 'pates')
+
+    def __eq__(self, other):
+        """
+        Deux statistiques sont égales si tous leurs compteurs sont égaux.
+        """
+        if not isinstance(other, FromageStats):
+            return NotImplemented
+        return (self.total, self.letters, self.normalised_letters, self.familles, self.pates) \
+            == (other.total, other.letters, other.normalised_letters, other.familles, other.pates)
+
+    @staticmethod
+    def _shift(counter, key, count):
+        """
+        Ajoute `count` à une clé d'un compteur et retire la clé lorsqu'elle tombe à zéro.
+        Une clé absente (None, NaN) est ignorée.
+        """
+        if _is_missing(key):
+            return
+        value = counter[key] + count
+        if value:
+            counter[key] = value
+        else:
+            del counter[key]
+
+    @staticmethod
+    def _as_series(counter, index_name):
+        """
+        Convertit un compteur en pd.Series triée comme le fait value_counts.
+        """
+        series = pd.Series(dict(counter.most_common()), name='count', dtype='int64')
+        series.index.name = index_name
+        return series
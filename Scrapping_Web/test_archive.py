@@ -0,0 +1,160 @@
+"""
+Module de tests pour le script archive.py
+
+Ce module contient des tests unitaires pour la classe PageArchive et le rejeu
+des pages archivées par la classe FromageETL. Aucun test n'accède au réseau.
+
+Usage:
+- Exécutez le script en utilisant pytest pour exécuter tous les tests définis dans ce module.
+
+Exemple:
+    pytest -s test_archive.py
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import patch
+import pytest
+
+
+from archive import PageArchive
+from scrap_jerome import FromageETL, parse_page
+
+URL = "https://www.laboitedufromager.com/liste-des-fromages-par-ordre-alphabetique/"
+PAGE_1 = b"<table><tr><td>Fromage1</td><td>Famille1</td><td>Pate1</td></tr></table>"
+PAGE_2 = (b"<table><tr><td>Fromage1</td><td>Famille1</td><td>Pate1</td></tr>"
+          b"<tr><td>Fromage2</td><td>Famille2</td><td>Pate2</td></tr></table>")
+
+
+@pytest.fixture(name="archive")
+def archive_fixture(tmp_path):
+    """
+    Fixture pour créer une archive vide dans un dossier temporaire.
+
+    Returns:
+    - PageArchive: Une instance de la classe PageArchive.
+    """
+    return PageArchive(tmp_path / "archive")
+
+
+def test_store_and_load(archive):
+    """
+    Test unitaire pour les méthodes store et load de la classe PageArchive.
+
+    Assure que le contenu relu est identique au contenu archivé.
+    """
+    sha256 = archive.store(URL, PAGE_1)
+    assert archive.load(sha256) == PAGE_1
+
+
+def test_store_deduplicates_content(archive, tmp_path):
+    """
+    Test unitaire pour la méthode store de la classe PageArchive.
+
+    Assure qu'un même contenu récupéré deux fois n'est stocké qu'une seule fois,
+    tout en gardant les deux entrées dans l'index.
+    """
+    archive.store(URL, PAGE_1, datetime(2024, 1, 1))
+    archive.store(URL, PAGE_1, datetime(2024, 2, 1))
+    objects = [path for path in (tmp_path / "archive" / "objects").rglob("*") if path.is_file()]
+    assert len(objects) == 1
+    assert len(archive.entries(URL)) == 2
+
+
+def test_latest(archive):
+    """
+    Test unitaire pour la méthode latest de la classe PageArchive.
+
+    Assure que la récupération la plus récente, ou antérieure à une date, est retournée.
+    """
+    sha_1 = archive.store(URL, PAGE_1, datetime(2024, 1, 1))
+    sha_2 = archive.store(URL, PAGE_2, datetime(2024, 3, 1))
+    assert archive.latest(URL) == sha_2
+    assert archive.latest(URL, datetime(2024, 2, 1)) == sha_1
+    assert archive.latest("https://example.invalid/") is None
+
+
+@patch('scrap_jerome.urlopen')
+def test_extract_archives_and_replay(mock_urlopen, archive):
+    """
+    Test unitaire pour les méthodes extract et replay de la classe FromageETL.
+
+    Assure que la page téléchargée est archivée, puis que le rejeu
+    produit la même transformation sans appel réseau.
+    """
+    mock_urlopen.return_value.read.return_value = PAGE_2
+    etl = FromageETL(URL, archive=archive)
+    etl.extract()
+    etl.transform()
+    expected_names = etl.data['fromage_names'].tolist()
+
+    mock_urlopen.reset_mock()
+    etl.replay()
+    etl.transform()
+    mock_urlopen.assert_not_called()
+    assert etl.data['fromage_names'].tolist() == expected_names
+
+
+def test_replay_without_archive():
+    """
+    Test unitaire pour la méthode replay de la classe FromageETL.
+
+    Assure qu'une erreur est levée lorsqu'aucune archive n'est configurée.
+    """
+    with pytest.raises(ValueError):
+        FromageETL(URL).replay()
+
+
+def test_retransform_all(archive):
+    """
+    Test unitaire pour la méthode retransform_all de la classe PageArchive.
+
+    Assure que toutes les pages archivées sont transformées dans le pool de processus,
+    avec la date de récupération comme date de création.
+    """
+    archive.store(URL, PAGE_1, datetime(2024, 1, 1))
+    archive.store(URL, PAGE_2, datetime(2024, 3, 1))
+    result = archive.retransform_all(max_workers=2)
+    assert result['fromage_names'].tolist() == ["Fromage1", "Fromage1", "Fromage2"]
+    assert result['creation_date'].iloc[-1] == datetime(2024, 3, 1)
+    assert set(result['url']) == {URL}
+
+
+def test_retransform_all_parses_each_content_once(archive):
+    """
+    Test unitaire pour la méthode retransform_all de la classe PageArchive.
+
+    Assure qu'un contenu récupéré plusieurs fois n'est analysé qu'une fois,
+    et que ses lignes sont reprises pour chaque récupération.
+    """
+    for month in (1, 2, 3):
+        archive.store(URL, PAGE_2, datetime(2024, month, 1))
+    archive.store(f"{URL}?copie", PAGE_2, datetime(2024, 4, 1))
+    archive.store(URL, PAGE_1, datetime(2024, 5, 1))
+    with patch('archive.parse_page', wraps=parse_page) as mock_parse_page:
+        result = archive.retransform_all(max_workers=1)
+    assert mock_parse_page.call_count == 2
+    assert len(result) == 4 * 2 + 1
+    assert result['creation_date'].tolist()[::2] == [
+        datetime(2024, 1, 1), datetime(2024, 2, 1), datetime(2024, 3, 1),
+        datetime(2024, 4, 1), datetime(2024, 5, 1)]
+    assert result['url'].tolist()[6:8] == [f"{URL}?copie"] * 2
+    assert archive.retransform_all(url="https://example.invalid/").columns.tolist() == [
+        'fromage_names', 'fromage_familles', 'pates', 'creation_date', 'url']
+
+
+def test_store_from_threads(archive):
+    """
+    Test unitaire pour la méthode store de la classe PageArchive.
+
+    Assure que plusieurs threads archivant le même contenu en même temps
+    réussissent tous et écrivent chacun leur ligne d'index.
+    """
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        for round_number in range(10):
+            # Un contenu nouveau à chaque tour, pour que les threads se disputent l'objet
+            content = PAGE_2 * 50_000 + str(round_number).encode('ascii')
+            digests = list(executor.map(lambda url, data=content: archive.store(url, data),
+                                        [f"{URL}?page={i}" for i in range(4)]))
+            assert len(set(digests)) == 1
+            assert archive.load(digests[0]) == content
+    assert len(archive.entries()) == 40
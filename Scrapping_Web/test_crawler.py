@@ -0,0 +1,172 @@
+"""
+Module de tests pour le script crawler.py
+
+Ce module contient des tests unitaires pour les classes FromageCrawler et HostThrottle.
+Les tests explorent un petit site local à plusieurs pages servi par http.server,
+sans aucun accès à Internet.
+
+Usage:
+- Exécutez le script en utilisant pytest pour exécuter tous les tests définis dans ce module.
+
+Exemple:
+    pytest -s test_crawler.py
+"""
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+
+
+from crawler import FromageCrawler, HostThrottle
+from scrap_jerome import FromageETL
+
+SITE = {
+    "/robots.txt": "User-agent: *\nDisallow: /prive/\n",
+    "/liste/": """<a href="/liste/b/">B</a> <a href="/liste/c/#haut">C</a>
+        <a href="/prive/">Privé</a> <a href="http://ailleurs.invalid/liste/">Ailleurs</a>
+        <table><tr><td>Fromage</td><td>Famille</td><td>Pâte</td></tr>
+        <tr><td>Abondance</td><td>Savoyarde</td><td>Pressée cuite</td></tr></table>""",
+    "/liste/b/": """<a href="/liste/">A</a> <a href="/liste/c/">C</a>
+        <table><tr><th>Fromage</th><th>Famille</th><th>Pâte</th></tr>
+        <tr><td>Beaufort</td><td>Savoyarde</td><td>Pressée cuite</td></tr>
+        <tr><td>Brie</td><td>Brie</td><td>Molle</td></tr></table>""",
+    "/liste/c/": """<a href="/liste/b/">B</a> <a href="/liste/d/">D</a>
+        <table><tr><td>Cantal</td><td>Auvergnate</td><td>Pressée</td></tr></table>""",
+    "/prive/": """<table><tr><td>Secret</td><td>Secret</td><td>Secret</td></tr></table>""",
+}
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    """
+    Gestionnaire HTTP servant les pages de SITE, comptant les requêtes reçues
+    et notant l'agent utilisateur de chacune.
+    """
+    hits = Counter()
+    agents = {}
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """
+        Répond à une requête GET avec la page demandée, ou une erreur 404.
+        """
+        SiteHandler.hits[self.path] += 1
+        SiteHandler.agents[self.path] = self.headers.get('User-Agent')
+        page = SITE.get(self.path)
+        if page is None:
+            self.send_error(404)
+            return
+        body = page.encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """
+        Désactive les journaux du serveur pendant les tests.
+        """
+
+
+@pytest.fixture(name="site_url")
+def site_url_fixture():
+    """
+    Fixture pour démarrer le site local dans un thread.
+
+    Returns:
+    - str: L'URL de base du site local.
+    """
+    SiteHandler.hits.clear()
+    SiteHandler.agents.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SiteHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_crawl_merges_all_listing_pages(site_url):
+    """
+    Test unitaire pour la méthode crawl de la classe FromageCrawler.
+
+    Assure que les pages liées sont découvertes et fusionnées dans l'ordre de découverte,
+    que chaque page n'est téléchargée qu'une fois et que robots.txt est respecté.
+    """
+    crawler = FromageCrawler(f"{site_url}/liste/", delay=0, parse_workers=2)
+    data = crawler.crawl()
+
+    assert data['fromage_names'].tolist() == ["Abondance", "Beaufort", "Brie", "Cantal"]
+    assert all(count == 1 for count in SiteHandler.hits.values())
+    assert "/prive/" not in SiteHandler.hits
+    # /liste/d/ n'existe pas : l'erreur est conservée sans interrompre l'exploration
+    assert [url for url, _ in crawler.errors] == [f"{site_url}/liste/d/"]
+
+
+def test_crawl_max_pages(site_url):
+    """
+    Test unitaire pour la méthode crawl de la classe FromageCrawler.
+
+    Assure que le nombre de pages téléchargées ne dépasse pas max_pages.
+    """
+    data = FromageCrawler(f"{site_url}/liste/", max_pages=2, delay=0).crawl()
+    assert data['fromage_names'].tolist() == ["Abondance", "Beaufort", "Brie"]
+
+
+def test_allowed(site_url):
+    """
+    Test unitaire pour la méthode allowed de la classe FromageCrawler.
+
+    Assure que les autres hôtes, les pages interdites et les liens hors filtre sont ignorés.
+    """
+    crawler = FromageCrawler(f"{site_url}/liste/", link_pattern=r"/liste/[a-z]/$")
+    assert crawler.allowed(f"{site_url}/liste/b/")
+    assert not crawler.allowed(f"{site_url}/prive/")
+    assert not crawler.allowed(f"{site_url}/autre/")
+    assert not crawler.allowed("http://ailleurs.invalid/liste/b/")
+    assert not crawler.allowed("mailto:fromager@example.com")
+
+
+def test_robots_fetch(site_url):
+    """
+    Test unitaire pour la lecture de robots.txt par la classe FromageCrawler.
+
+    Assure que robots.txt est demandé une seule fois avec l'agent utilisateur du robot,
+    et qu'un hôte injoignable n'empêche pas l'exploration.
+    """
+    crawler = FromageCrawler(f"{site_url}/liste/", user_agent="TestCrawler/1.0", timeout=1)
+    assert crawler.allowed(f"{site_url}/liste/b/")
+    assert crawler.allowed(f"{site_url}/liste/c/")
+    assert SiteHandler.hits["/robots.txt"] == 1
+    assert SiteHandler.agents["/robots.txt"] == "TestCrawler/1.0"
+
+    unreachable = FromageCrawler("http://127.0.0.1:1/liste/", timeout=1)
+    assert unreachable.allowed("http://127.0.0.1:1/liste/b/")
+
+
+def test_load(site_url, tmp_path):
+    """
+    Test unitaire pour la méthode load de la classe FromageCrawler.
+
+    Assure que toutes les lignes sont chargées en une seule table SQLite.
+    """
+    database_name = tmp_path / "fromages.sqlite"
+    FromageCrawler(f"{site_url}/liste/", delay=0).load(database_name, "fromages_table")
+    data_from_db = FromageETL(site_url).read_from_database(database_name, "fromages_table")
+    assert len(data_from_db) == 4
+
+
+def test_host_throttle():
+    """
+    Test unitaire pour la méthode wait de la classe HostThrottle.
+
+    Assure que les requêtes vers un même hôte sont espacées, mais pas celles d'hôtes différents.
+    """
+    throttle = HostThrottle(0.05)
+    start = time.monotonic()
+    throttle.wait("a")
+    throttle.wait("b")
+    assert time.monotonic() - start < 0.05
+    throttle.wait("a")
+    throttle.wait("a")
+    assert time.monotonic() - start >= 0.1
@@ -0,0 +1,81 @@
+"""
+Module de tests pour le script dedupe.py
+
+Ce module contient des tests unitaires pour la normalisation des noms, le dédoublonnage
+et l'étape de dédoublonnage de la méthode transform de la classe FromageETL.
+
+Usage:
+- Exécutez le script en utilisant pytest pour exécuter tous les tests définis dans ce module.
+
+Exemple:
+    pytest -s test_dedupe.py
+"""
+import pandas as pd
+
+
+from dedupe import dedupe, exact_duplicates, near_duplicates, normalise_key
+from scrap_jerome import FromageETL
+
+
+def test_normalise_key():
+    """
+    Test unitaire pour la fonction normalise_key.
+
+    Assure que les variantes de casse, d'espaces et d'accents ont la même clé.
+    """
+    assert normalise_key("Comté") == normalise_key("  COMTE ") == "comte"
+    assert normalise_key("Saint  Nectaire") == normalise_key("saint nectaire")
+    assert normalise_key("Époisses") == "epoisses"
+    assert normalise_key(None) == ''
+
+
+def test_exact_duplicates():
+    """
+    Test unitaire pour la fonction exact_duplicates.
+
+    Assure que seule la première occurrence de chaque clé est conservée.
+    """
+    assert exact_duplicates(["brie", "comte", "brie", "brie"]) == [True, True, False, False]
+
+
+def test_near_duplicates():
+    """
+    Test unitaire pour la fonction near_duplicates.
+
+    Assure que les fautes de frappe sont regroupées avec la première occurrence,
+    sans regrouper des fromages différents.
+    """
+    keys = ["roquefort", "reblochon", "roquefor", "rocamadour", "reblochonn", "brie"]
+    assert near_duplicates(keys, threshold=0.9) == [True, True, False, True, False, True]
+
+
+def test_dedupe_report():
+    """
+    Test unitaire pour la fonction dedupe.
+
+    Assure que chaque étape est rapportée avec ses lignes en entrée et en sortie.
+    """
+    data = pd.DataFrame({'fromage_names': ["Comté", "comte", "Roquefort", "Roquefor"],
+                         'fromage_familles': ["Jura"] * 4, 'pates': ["Pressée"] * 4})
+    result, report = dedupe(data, near_threshold=0.9)
+    assert result['fromage_names'].tolist() == ["Comté", "Roquefort"]
+    assert [(step['stage'], step['rows_in'], step['rows_out']) for step in report] == \
+        [('normalise', 4, 4), ('exact', 4, 3), ('near', 3, 2)]
+
+
+def test_transform_dedupe():
+    """
+    Test unitaire pour l'option dedupe de la méthode transform de la classe FromageETL.
+
+    Assure que les variantes d'un même fromage ne sont chargées qu'une fois
+    et que le rapport des étapes est conservé.
+    """
+    etl = FromageETL(None)
+    etl.data = """<table>
+        <tr><td>Comté</td><td>Jurassienne</td><td>Pressée cuite</td></tr>
+        <tr><td> COMTE </td><td>Jurassienne</td><td>Pressée cuite</td></tr>
+        <tr><td>Brie</td><td>Brie</td><td>Molle</td></tr></table>""".encode('utf-8')
+    etl.transform(dedupe=True)
+    assert etl.data['fromage_names'].tolist() == ["Comté", "Brie"]
+    assert etl.total_count() == 2
+    assert [step['stage'] for step in etl.stage_report] == ['parse', 'normalise', 'exact']
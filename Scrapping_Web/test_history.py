@@ -0,0 +1,231 @@
+"""
+Module de tests pour le script history.py
+
+Ce module contient des tests unitaires pour la classe FromageHistory
+et le mode de chargement versionné de la classe FromageETL.
+
+Usage:
+- Exécutez le script en utilisant pytest pour exécuter tous les tests définis dans ce module.
+
+Exemple:
+    pytest -s test_history.py
+"""
+import sqlite3
+from datetime import date, datetime
+import pandas as pd
+import pytest
+
+
+from history import FromageHistory
+from scrap_jerome import FromageETL
+
+
+def make_frame(names):
+    """
+    Construit un DataFrame de fromages à partir d'une liste de noms.
+
+    Parameters:
+    - names (list): Les noms de fromages.
+
+    Returns:
+    - pd.DataFrame: Un DataFrame avec les colonnes 'fromage_names', 'fromage_familles' et 'pates'.
+    """
+    return pd.DataFrame({'fromage_names': names,
+                         'fromage_familles': ['Famille'] * len(names),
+                         'pates': ['Pate'] * len(names)})
+
+
+@pytest.fixture(name="history")
+def history_fixture(tmp_path):
+    """
+    Fixture pour créer un historique vide dans une base temporaire.
+
+    Returns:
+    - FromageHistory: Une instance de la classe FromageHistory.
+    """
+    return FromageHistory(tmp_path / "fromages.sqlite", "fromages_table")
+
+
+def count_history_rows(history):
+    """
+    Compte les lignes stockées dans la table d'historique.
+    """
+    con = sqlite3.connect(history.database_name)
+    count = con.execute(f"SELECT COUNT(*) FROM {history.history_name}").fetchone()[0]
+    con.close()
+    return count
+
+
+def test_load_only_stores_changes(history):
+    """
+    Test unitaire pour la méthode load de la classe FromageHistory.
+
+    Assure que les lignes inchangées ne sont pas dupliquées d'un lot à l'autre.
+    """
+    history.load(make_frame(["Brie", "Comté", "Morbier"]))
+    history.load(make_frame(["Brie", "Comté", "Morbier"]))
+    history.load(make_frame(["Brie", "Comté", "Cantal"]))
+    assert count_history_rows(history) == 4
+    assert history.read()['fromage_names'].tolist() == ["Brie", "Comté", "Cantal"]
+
+
+def test_read_as_of_batch(history):
+    """
+    Test unitaire pour la méthode read de la classe FromageHistory.
+
+    Assure que chaque lot passé peut être relu tel qu'il était.
+    """
+    first = history.load(make_frame(["Brie", "Comté"]))
+    second = history.load(make_frame(["Comté", "Cantal"]))
+    history.load(make_frame(["Cantal"]))
+    assert history.read(as_of=first)['fromage_names'].tolist() == ["Brie", "Comté"]
+    assert history.read(as_of=second)['fromage_names'].tolist() == ["Comté", "Cantal"]
+    assert history.read()['fromage_names'].tolist() == ["Cantal"]
+
+
+def test_read_as_of_date(history):
+    """
+    Test unitaire pour la méthode read de la classe FromageHistory.
+
+    Assure qu'une date retient le dernier lot chargé à cette date.
+    """
+    history.load(make_frame(["Brie"]), loaded_at=datetime(2024, 1, 1))
+    history.load(make_frame(["Comté"]), loaded_at=datetime(2024, 2, 1))
+    assert history.read(as_of=datetime(2024, 1, 15))['fromage_names'].tolist() == ["Brie"]
+    assert history.read(as_of="2024-03-01")['fromage_names'].tolist() == ["Comté"]
+    assert history.read(as_of=datetime(2023, 1, 1)).empty
+
+
+def test_read_as_of_date_strings(history):
+    """
+    Test unitaire pour la méthode resolve_batch de la classe FromageHistory.
+
+    Assure que les dates en chaîne sont comparées comme des dates : séparateur espace
+    (str(datetime), pandas) et date sans heure désignant la fin de la journée.
+    """
+    history.load(make_frame(["Brie"]), loaded_at=datetime(2024, 1, 1))
+    history.load(make_frame(["Comté"]), loaded_at=datetime(2024, 2, 1, 12))
+    assert history.resolve_batch("2024-02-01 13:00") == 2
+    assert history.resolve_batch("2024-02-01T11:59") == 1
+    assert history.resolve_batch(str(pd.Timestamp("2024-02-01 12:00"))) == 2
+    assert history.resolve_batch("2024-01-01") == 1
+    assert history.resolve_batch(date(2024, 2, 1)) == 2
+    assert history.resolve_batch("2023-12-31") is None
+    assert history.read(as_of="2024-01-01")['fromage_names'].tolist() == ["Brie"]
+    with pytest.raises(ValueError):
+        history.resolve_batch("hier")
+
+
+def test_load_keeps_duplicates(history):
+    """
+    Test unitaire pour la méthode load de la classe FromageHistory.
+
+    Assure que les doublons exacts sont conservés et retirés un à un.
+    """
+    history.load(make_frame(["Brie", "Brie"]))
+    history.load(make_frame(["Brie"]))
+    assert history.read()['fromage_names'].tolist() == ["Brie"]
+    assert history.read(as_of=1)['fromage_names'].tolist() == ["Brie", "Brie"]
+
+
+def test_unversioned_table_is_rejected(tmp_path):
+    """
+    Test unitaire pour la méthode load de la classe FromageHistory.
+
+    Assure qu'une table chargée sans historique n'est pas écrasée.
+    """
+    database_name = tmp_path / "fromages.sqlite"
+    etl = FromageETL(None)
+    etl.data = make_frame(["Brie"])
+    etl.load(database_name, "fromages_table")
+    with pytest.raises(ValueError):
+        FromageHistory(database_name, "fromages_table").load(make_frame(["Comté"]))
+    assert etl.read_from_database(database_name, "fromages_table")['fromage_names'].tolist() == ["Brie"]
+
+
+def test_versioned_table_is_not_replaced(tmp_path):
+    """
+    Test unitaire pour la méthode load de la classe FromageETL.
+
+    Assure qu'un chargement classique sur une table versionnée est refusé clairement.
+    """
+    database_name = tmp_path / "fromages.sqlite"
+    etl = FromageETL(None)
+    etl.data = make_frame(["Brie"])
+    etl.load(database_name, "fromages_table", versioned=True)
+    with pytest.raises(ValueError, match="versionnée"):
+        etl.load(database_name, "fromages_table")
+    assert etl.read_from_database(database_name, "fromages_table")['fromage_names'].tolist() == ["Brie"]
+
+
+def test_read_leaves_schema_unchanged(tmp_path):
+    """
+    Test unitaire pour la méthode read de la classe FromageHistory.
+
+    Assure qu'une lecture sur une table non versionnée ne crée ni table ni vue.
+    """
+    database_name = tmp_path / "fromages.sqlite"
+    etl = FromageETL(None)
+    etl.data = make_frame(["Brie"])
+    etl.load(database_name, "fromages_table")
+    con = sqlite3.connect(database_name)
+    schema = con.execute("SELECT name FROM sqlite_master ORDER BY name").fetchall()
+    con.close()
+
+    with pytest.raises(ValueError):
+        etl.read_from_database(database_name, "fromages_table", as_of=1)
+    con = sqlite3.connect(database_name)
+    assert con.execute("SELECT name FROM sqlite_master ORDER BY name").fetchall() == schema
+    con.close()
+
+
+def test_resolve_batch_types(history):
+    """
+    Test unitaire pour la méthode resolve_batch de la classe FromageHistory.
+
+    Assure que les numéros de lot lus avec batches (numpy.int64) sont acceptés
+    et qu'un type non pris en charge est refusé.
+    """
+    history.load(make_frame(["Brie"]))
+    history.load(make_frame(["Comté"]))
+    first = history.batches()['batch_id'].iloc[0]
+    assert history.resolve_batch(first) == 1
+    assert history.read(as_of=first)['fromage_names'].tolist() == ["Brie"]
+    with pytest.raises(TypeError):
+        history.resolve_batch(1.5)
+    with pytest.raises(TypeError):
+        history.resolve_batch(True)
+
+
+def test_read_as_of_uses_index(history):
+    """
+    Test unitaire pour la méthode read de la classe FromageHistory.
+
+    Assure que la lecture d'un lot passé ne parcourt pas tout l'historique.
+    """
+    history.load(make_frame(["Brie", "Comté"]))
+    con = sqlite3.connect(history.database_name)
+    plan = con.execute(f"EXPLAIN QUERY PLAN {history._as_of_query()}", {'batch': 1}).fetchall()
+    con.close()
+    details = [row[-1] for row in plan]
+    assert not any(detail.startswith("SCAN h") for detail in details)
+
+
+def test_etl_versioned_load(tmp_path):
+    """
+    Test unitaire pour le mode versionné des méthodes load et read_from_database
+    de la classe FromageETL.
+
+    Assure que les lectures existantes voient l'état courant et que as_of relit le passé.
+    """
+    database_name = tmp_path / "fromages.sqlite"
+    etl = FromageETL(None)
+    etl.data = make_frame(["Brie", "Comté"])
+    etl.load(database_name, "fromages_table", versioned=True)
+    etl.data = make_frame(["Cantal"])
+    etl.load(database_name, "fromages_table", versioned=True)
+
+    names = etl.get_fromage_names(database_name, "fromages_table")['fromage_names'].tolist()
+    assert names == ["Cantal"]
+    old = etl.read_from_database(database_name, "fromages_table", as_of=1)
+    assert old['fromage_names'].tolist() == ["Brie", "Comté"]
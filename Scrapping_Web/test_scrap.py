@@ -64,6 +64,22 @@ def test_transform(etl_instance):
     assert etl_instance.data['fromage_familles'].iloc[0] == "Famille1"
     assert etl_instance.data['pates'].iloc[0] == "Pate1"
 
+def test_transform_many(etl_instance):
+    """
+    Test unitaire pour la méthode transform_many de la classe FromageETL.
+
+    Assure que les lignes de toutes les pages sont concaténées dans l'ordre des pages,
+    quel que soit le nombre de processus.
+    """
+    pages = [f"<table><tr><td>Fromage{i}</td><td>Famille{i}</td><td>Pate{i}</td></tr></table>"
+             .encode('utf-8') for i in range(5)]
+    expected_names = [f"Fromage{i}" for i in range(5)]
+    etl_instance.transform_many(pages, max_workers=1, chunksize=2)
+    assert etl_instance.data['fromage_names'].tolist() == expected_names
+    etl_instance.transform_many(pages, max_workers=2, chunksize=2)
+    assert etl_instance.data['fromage_names'].tolist() == expected_names
+    assert 'creation_date' in etl_instance.data.columns
+
 def test_load_and_read_from_database(etl_instance, tmp_path):
     """
     Test unitaire pour les méthodes load et read_from_database de la classe FromageETL.
@@ -234,6 +250,70 @@ def test_update_fromage_name(etl_instance):
     etl_instance.update_fromage_name('Test Fromage', 'Updated Fromage')
     assert 'Updated Fromage' in etl_instance.data['fromage_names'].values
 
+def test_count_by_letter_normalise(etl_instance):
+    """
+    Test unitaire pour l'option normalise de la méthode count_by_letter de la classe FromageETL.
+
+    Assure que les lettres accentuées ou en minuscule sont regroupées avec leur majuscule.
+    """
+    etl_instance.data = """<table>
+        <tr><td>Emmental</td><td>Suisse</td><td>Pressée cuite</td></tr>
+        <tr><td>Époisses</td><td>Bourguignonne</td><td>Molle</td></tr>
+        <tr><td>ossau-iraty</td><td>Basque</td><td>Pressée</td></tr></table>""".encode('utf-8')
+    etl_instance.transform()
+    assert etl_instance.count_by_letter().to_dict() == {'E': 1, 'É': 1, 'o': 1}
+    assert etl_instance.count_by_letter(normalise=True).to_dict() == {'E': 2, 'O': 1}
+
+def test_incremental_stats(etl_instance):
+    """
+    Test unitaire pour les statistiques incrémentales de la classe FromageETL.
+
+    Assure qu'après une suite de modifications, les décomptes tenus à jour
+    sont identiques à un recalcul complet.
+    """
+    etl_instance.check_stats = True
+    etl_instance.data = b"<table><tr><td>Brie</td><td>Brie</td><td>Molle</td></tr></table>"
+    etl_instance.transform()
+    etl_instance.add_row('Comté', 'Jurassienne', 'Pressée cuite')
+    etl_instance.add_row('Cantal', 'Auvergnate', 'Pressée')
+    etl_instance.add_row('Cantal', 'Auvergnate', 'Pressée')
+    etl_instance.update_fromage_name('Brie', 'Brillat-Savarin')
+    etl_instance.sort_descending()
+    etl_instance.delete_row('Cantal')
+
+    assert etl_instance.verify_stats()
+    assert etl_instance.total_count() == len(etl_instance.data) == 2
+    expected_letters = etl_instance.data['fromage_names'].str[0].value_counts()
+    assert etl_instance.count_by_letter().to_dict() == expected_letters.to_dict()
+    assert etl_instance.count_by_famille().to_dict() == {'Brie': 1, 'Jurassienne': 1}
+    assert etl_instance.count_by_pate().to_dict() == {'Molle': 1, 'Pressée cuite': 1}
+
+    # Un DataFrame remplacé directement est pris en compte à la lecture suivante
+    etl_instance.data = etl_instance.data.head(1)
+    assert etl_instance.total_count() == 1
+
+def test_incremental_stats_missing_values(etl_instance):
+    """
+    Test unitaire pour les statistiques incrémentales de la classe FromageETL.
+
+    Assure que les familles et pâtes absentes (None, NaN) sont ignorées
+    comme par value_counts, après un ajout comme après un recalcul.
+    """
+    etl_instance.check_stats = True
+    etl_instance.data = b"<table><tr><td>Brie</td><td>Brie</td><td>Molle</td></tr></table>"
+    etl_instance.transform()
+    etl_instance.add_row('Xaintrailles', None, 'Pressée')
+    etl_instance.add_row('Yenne', 'Savoyarde', float('nan'))
+
+    assert etl_instance.count_by_famille().to_dict() == \
+        etl_instance.data['fromage_familles'].value_counts().to_dict()
+    assert etl_instance.count_by_pate().to_dict() == \
+        etl_instance.data['pates'].value_counts().to_dict()
+    etl_instance.delete_row('Xaintrailles')
+    etl_instance.delete_row('Yenne')
+    assert etl_instance.count_by_famille().to_dict() == {'Brie': 1}
+    assert etl_instance.count_by_pate().to_dict() == {'Molle': 1}
+
 def test_group_and_count_by_first_letter(etl_instance, tmp_path):
     """
     Test unitaire pour la méthode group_and_count_by_first_letter de la classe FromageETL.
@@ -0,0 +1,242 @@
+"""
+Module de tests pour le script service.py
+
+Ce module contient des tests unitaires pour la classe FromageService.
+Le service est démarré sur un port libre de localhost, sur une base temporaire.
+
+Usage:
+- Exécutez le script en utilisant pytest pour exécuter tous les tests définis dans ce module.
+
+Exemple:
+    pytest -s test_service.py
+"""
+import gzip
+import json
+import time
+from http.client import HTTPConnection
+import pandas as pd
+import pytest
+
+
+from history import FromageHistory
+from scrap_jerome import FromageETL
+from service import FromageService
+
+FROMAGES = pd.DataFrame({
+    'fromage_names': ["Brie de Meaux", "Brillat-Savarin", "Comté", "Époisses", "Cantal"],
+    'fromage_familles': ["Brie", "Triple crème", "Jurassienne", "Bourguignonne", "Auvergnate"],
+    'pates': ["Molle", "Molle", "Pressée cuite", "Molle", "Pressée"],
+})
+
+
+def load(database_name, data):
+    """
+    Charge un DataFrame dans la table servie.
+    """
+    etl = FromageETL(None)
+    etl.data = data
+    etl.load(database_name, "fromages_table")
+
+
+@pytest.fixture(name="service")
+def service_fixture(tmp_path):
+    """
+    Fixture pour démarrer le service sur une base contenant FROMAGES.
+
+    Returns:
+    - FromageService: Le service démarré.
+    """
+    database_name = tmp_path / "fromages.sqlite"
+    load(database_name, FROMAGES)
+    fromage_service = FromageService(database_name, port=0)
+    fromage_service.start()
+    yield fromage_service
+    fromage_service.stop()
+
+
+def request(service, path, headers=None):
+    """
+    Envoie une requête GET au service.
+
+    Returns:
+    - tuple: Le statut, les en-têtes et le corps décodé (JSON) de la réponse.
+    """
+    host, port = service.server.server_address[:2]
+    con = HTTPConnection(host, port)
+    con.request("GET", path, headers=headers or {})
+    response = con.getresponse()
+    body = response.read()
+    con.close()
+    if response.getheader("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return response.status, response, json.loads(body) if body else None
+
+
+def test_count_and_stats(service):
+    """
+    Test unitaire pour les points d'accès /count et /stats de la classe FromageService.
+
+    Assure que les décomptes correspondent aux données chargées.
+    """
+    assert request(service, "/count")[2] == {'total': 5}
+    assert request(service, "/stats/pates")[2] == {'Molle': 3, 'Pressée': 1, 'Pressée cuite': 1}
+    assert request(service, "/stats/lettres")[2] == {'B': 2, 'C': 2, 'É': 1}
+
+
+def test_fromages_streamed_and_filtered(service):
+    """
+    Test unitaire pour le point d'accès /fromages de la classe FromageService.
+
+    Assure que les lignes sont envoyées en flux et que les filtres et la pagination s'appliquent.
+    """
+    status, response, rows = request(service, "/fromages")
+    assert status == 200
+    assert response.getheader("Transfer-Encoding") == "chunked"
+    assert [row['fromage_names'] for row in rows] == FROMAGES['fromage_names'].tolist()
+
+    rows = request(service, "/fromages?pate=Molle&limit=2&offset=1")[2]
+    assert [row['fromage_names'] for row in rows] == ["Brillat-Savarin", "Époisses"]
+
+
+def test_search(service):
+    """
+    Test unitaire pour le point d'accès /search de la classe FromageService.
+
+    Assure que la recherche ignore la casse et les accents, et que q est obligatoire.
+    """
+    rows = request(service, "/search?q=bri")[2]
+    assert [row['fromage_names'] for row in rows] == ["Brie de Meaux", "Brillat-Savarin"]
+    expected = {"%C3%A9po": "Époisses", "epo": "Époisses", "%C3%89POI": "Époisses",
+                "comte": "Comté", "COMT%C3%89": "Comté"}
+    for query, name in expected.items():
+        rows = request(service, f"/search?q={query}")[2]
+        assert [row['fromage_names'] for row in rows] == [name]
+    assert request(service, "/search?q=%25")[2] == []
+    assert request(service, "/search")[0] == 400
+    assert request(service, "/fromages?limit=abc")[0] == 400
+    assert request(service, "/inconnu")[0] == 404
+
+
+def test_gzip(service):
+    """
+    Test unitaire pour la compression des réponses de la classe FromageService.
+
+    Assure que les réponses complètes et en flux sont compressées si le client l'accepte.
+    """
+    for path in ("/count", "/fromages"):
+        _, response, payload = request(service, path, {'Accept-Encoding': 'gzip'})
+        assert response.getheader("Content-Encoding") == "gzip"
+        assert payload
+
+
+def test_etag_follows_load_generation(service):
+    """
+    Test unitaire pour la revalidation par ETag de la classe FromageService.
+
+    Assure qu'un ETag reste valide jusqu'au chargement suivant de la table.
+    """
+    _, response, _ = request(service, "/count")
+    etag = response.getheader("ETag")
+    assert request(service, "/count", {'If-None-Match': etag})[0] == 304
+
+    load(service.database_name, FROMAGES.head(2))
+    status, response, payload = request(service, "/count", {'If-None-Match': etag})
+    assert status == 200
+    assert payload == {'total': 2}
+    assert response.getheader("ETag") != etag
+
+
+def test_etag_follows_history_load(tmp_path):
+    """
+    Test unitaire pour la revalidation par ETag de la classe FromageService.
+
+    Assure qu'un chargement direct de l'historique invalide aussi l'ETag d'une table versionnée.
+    """
+    etl = FromageETL(None)
+    etl.data = FROMAGES
+    etl.load(tmp_path / "fromages.sqlite", "fromages_table", versioned=True)
+    history = FromageHistory(tmp_path / "fromages.sqlite", "fromages_table")
+    fromage_service = FromageService(history.database_name, port=0)
+    fromage_service.start()
+    try:
+        _, response, _ = request(fromage_service, "/count")
+        etag = response.getheader("ETag")
+        history.load(FROMAGES.head(2))
+        status, response, payload = request(fromage_service, "/count", {'If-None-Match': etag})
+    finally:
+        fromage_service.stop()
+    assert status == 200
+    assert payload == {'total': 2}
+    assert response.getheader("ETag") != etag
+
+
+def test_etag_is_weak(service):
+    """
+    Test unitaire pour la revalidation par ETag de la classe FromageService.
+
+    Assure que l'ETag, commun aux réponses compressées ou non, est faible
+    et qu'il revalide les deux représentations.
+    """
+    _, response, _ = request(service, "/count", {'Accept-Encoding': 'gzip'})
+    etag = response.getheader("ETag")
+    assert etag.startswith('W/"')
+    assert request(service, "/count", {'If-None-Match': etag})[0] == 304
+
+
+def test_missing_table(tmp_path):
+    """
+    Test unitaire pour la gestion des erreurs SQLite de la classe FromageService.
+
+    Assure qu'une table absente donne une erreur JSON et que la connexion reste utilisable.
+    """
+    database_name = tmp_path / "fromages.sqlite"
+    load(database_name, FROMAGES)
+    fromage_service = FromageService(database_name, "absente", port=0)
+    fromage_service.start()
+    try:
+        host, port = fromage_service.server.server_address[:2]
+        con = HTTPConnection(host, port)
+        for path in ("/count", "/fromages"):
+            con.request("GET", path)
+            response = con.getresponse()
+            assert response.status == 503
+            assert "absente" in json.loads(response.read())['error']
+        con.close()
+    finally:
+        fromage_service.stop()
+
+
+def test_keep_alive(service):
+    """
+    Test unitaire pour la réutilisation des connexions de la classe FromageService.
+
+    Assure que plusieurs requêtes passent sur une même connexion HTTP.
+    """
+    host, port = service.server.server_address[:2]
+    con = HTTPConnection(host, port)
+    for path in ("/count", "/fromages", "/stats/familles"):
+        con.request("GET", path)
+        response = con.getresponse()
+        response.read()
+        assert response.status == 200
+    con.close()
+
+
+def test_keep_alive_latency(service):
+    """
+    Test unitaire pour la latence des connexions persistantes de la classe FromageService.
+
+    Assure que les réponses suivantes sur une même connexion n'attendent pas
+    l'acquittement différé du client (algorithme de Nagle, ~40 ms par requête).
+    """
+    host, port = service.server.server_address[:2]
+    con = HTTPConnection(host, port)
+    latencies = []
+    for path in ("/count", "/fromages", "/stats/pates") * 5:
+        start = time.perf_counter()
+        con.request("GET", path)
+        con.getresponse().read()
+        latencies.append(time.perf_counter() - start)
+    con.close()
+    latencies.sort()
+    assert latencies[len(latencies) // 2] < 0.02